@@ -0,0 +1,81 @@
+"""
+Per-request cost of AccessTokenBearer: the previous path (the token decoded
+and verified twice) against the current one (verified once, then served
+from the token cache).
+
+Run from backend/src so config.py finds .env:
+    python ../benchmarks/auth_overhead.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from starlette.requests import Request  # noqa: E402
+
+from auth.dependencies import AccessTokenBearer  # noqa: E402
+from auth.utils import (  # noqa: E402
+    _decode_user_token,
+    create_user_token,
+    token_cache,
+)
+
+import data  # noqa: E402
+
+
+def make_request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/complaints/enquiry",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+async def old_path(request: Request):
+    # What TokenBearer.__call__ used to do: decode, then decode again in token_valid
+    token = request.headers["authorization"].split(" ", 1)[1]
+    token_data = _decode_user_token(token)
+    _decode_user_token(token)
+    if token_data["refresh"]:
+        raise AssertionError("access token expected")
+    return token_data
+
+
+async def measure(func, request: Request, count: int) -> float:
+    await func(request)
+    start = time.perf_counter()
+    for _ in range(count):
+        await func(request)
+    return (time.perf_counter() - start) / count
+
+
+async def run(args):
+    token = create_user_token({"username": data.BENCH_USERNAME, "role": "ADMIN"})
+    request = make_request(token)
+    bearer = AccessTokenBearer()
+
+    old = await measure(old_path, request, args.requests)
+    token_cache.clear()
+    new = await measure(bearer, request, args.requests)
+
+    print(f"{args.requests} requests with one token, mean per request")
+    print(f"decode twice       {old * 1e6:8.1f} us")
+    print(f"token cache        {new * 1e6:8.1f} us")
+    print(f"saved              {(old - new) * 1e6:8.1f} us ({old / new:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+EXPLAIN ANALYZE timings of the complaint enquiry's search filters on a
+database seeded with seed.py (200k complaints by default), before and after
+the pg_trgm (and whole phone number) indexes.
+
+    python benchmarks/complaint_search.py --dsn postgresql://localhost/cms_bench
+
+"before" runs the previous predicates (plain ILIKE '%x%') with those
+indexes dropped inside a transaction that is rolled back; "after" runs the
+current predicates with the indexes in place. Each query is the enquiry's
+first page. Dropping the indexes locks the complaints table until the
+rollback, so only run this against a benchmark database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+import asyncpg
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from complaints.models import TRIGRAM_SEARCH_COLUMNS  # noqa: E402
+
+from seed import default_dsn  # noqa: E402
+
+QUERY = (
+    "SELECT * FROM complaints WHERE {where} "
+    "ORDER BY complaint_date, complaint_number LIMIT 50"
+)
+CONTAINS = "{column} ILIKE $1 ESCAPE '\\'"
+# The enquiry's complaint number filter: exact when the number is stored
+FULL_NUMBER = (
+    "complaint_number = $1 OR (complaint_number ILIKE '%' || $1 || '%' "
+    "AND NOT EXISTS (SELECT 1 FROM complaints x WHERE x.complaint_number = $1))"
+)
+
+
+def cases(sample) -> list:
+    """(label, previous (where, argument), current (where, argument))"""
+    number = sample["complaint_number"]
+    phone = sample["customer_contact1"]
+    serial = sample["product_serial_number"]
+    name = sample["customer_name"].split()[-1]
+
+    def old(column, value, other=None):
+        where = f"{column} ILIKE $1"
+        if other:
+            where += f" OR {other} ILIKE $1"
+        return where, f"%{value}%"
+
+    def new(column, value, other=None):
+        where = CONTAINS.format(column=column)
+        if other:
+            where += " OR " + CONTAINS.format(column=other)
+        return where, f"%{value}%"
+
+    contacts = ("customer_contact1", phone[-6:], "customer_contact2")
+    return [
+        (
+            "complaint number, part",
+            old("complaint_number", number[-6:]),
+            new("complaint_number", number[-6:]),
+        ),
+        (
+            "complaint number, full",
+            old("complaint_number", number),
+            (FULL_NUMBER, number),
+        ),
+        ("phone, part", old(*contacts), new(*contacts)),
+        (
+            "phone, full",
+            old("customer_contact1", phone, "customer_contact2"),
+            ("customer_contact1 = $1 OR customer_contact2 = $1", phone),
+        ),
+        ("customer name", old("customer_name", name), new("customer_name", name)),
+        (
+            "serial number, part",
+            old("product_serial_number", serial[-6:]),
+            new("product_serial_number", serial[-6:]),
+        ),
+    ]
+
+
+def scans(plan: dict) -> list:
+    """How the plan reads complaints: its leaf nodes, with index names."""
+    children = plan.get("Plans", [])
+    if not children:
+        index = plan.get("Index Name")
+        return [f"{plan['Node Type']} on {index}" if index else plan["Node Type"]]
+    return [scan for child in children for scan in scans(child)]
+
+
+async def explain(conn, where: str, argument: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        result = await conn.fetchval(
+            f"EXPLAIN (ANALYZE, FORMAT JSON) {QUERY.format(where=where)}", argument
+        )
+        root = json.loads(result)[0]
+        timings.append(root["Planning Time"] + root["Execution Time"])
+    return statistics.median(timings), ", ".join(dict.fromkeys(scans(root["Plan"])))
+
+
+async def run(args):
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        total = await conn.fetchval("SELECT count(*) FROM complaints")
+        indexes = [
+            f"ix_complaints_{column}_trgm" for column in TRIGRAM_SEARCH_COLUMNS
+        ] + ["ix_complaints_customer_contact1", "ix_complaints_customer_contact2"]
+        present = await conn.fetchval(
+            "SELECT count(*) FROM pg_indexes WHERE indexname = any($1::text[])",
+            indexes,
+        )
+        if present != len(indexes):
+            sys.exit("Search indexes missing; run `alembic upgrade head` first")
+        sample = await conn.fetchrow(
+            "SELECT * FROM complaints ORDER BY complaint_number OFFSET $1 LIMIT 1",
+            total // 2,
+        )
+        print(
+            f"{total} complaints, median of {args.repeat} runs "
+            "(planning + execution)"
+        )
+
+        for label, previous, current in cases(sample):
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                for index in indexes:
+                    await conn.execute(f"DROP INDEX {index}")
+                before, before_plan = await explain(conn, *previous, args.repeat)
+            finally:
+                await transaction.rollback()
+            after, after_plan = await explain(conn, *current, args.repeat)
+            print(f"{label:<24} before {before:9.2f} ms  after {after:9.2f} ms")
+            print(f"{'':<24}   {before_plan}  ->  {after_plan}")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dsn", default=default_dsn())
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL_CONNECT is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Memory and time of the complaint upload's parse/validate stage on a large CRM
+export: the previous path (whole file read, decoded and wrapped in StringIO,
+every row kept as a validated record) against CSVUploadReader batches,
+validated on the event loop and on the validation process pool. The database
+stage is left out; each batch is dropped once validated. Peak memory is the
+server process only.
+
+Run from backend/src so config.py finds .env:
+    python ../benchmarks/csv_ingest.py [--rows 500000]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi import UploadFile  # noqa: E402
+
+from complaints.schemas import ComplaintsSchema  # noqa: E402
+from complaints.service import (  # noqa: E402
+    UPLOAD_UPPERCASE_FIELDS,
+    normalize_upload_row,
+    parse_complaint_row,
+)
+from utils.csv_stream import CSVUploadReader  # noqa: E402
+from utils.validation import (  # noqa: E402
+    ErrorReport,
+    shutdown_validation_pool,
+    validate_batches,
+)
+
+import data  # noqa: E402
+from run import UPLOAD_COMPLAINT_COLUMNS  # noqa: E402
+
+
+def write_export(path: str, rows: int):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=UPLOAD_COMPLAINT_COLUMNS, extrasaction="ignore"
+        )
+        writer.writeheader()
+        for index in range(rows):
+            writer.writerow(data.complaint_row(42, index))
+
+
+async def old_path(file: UploadFile) -> int:
+    content = await file.read()
+    text = content.decode("utf-8-sig")
+    records = []
+    for raw_row in csv.DictReader(io.StringIO(text)):
+        row = normalize_upload_row(raw_row, UPLOAD_UPPERCASE_FIELDS)
+        records.append(ComplaintsSchema(**row))
+    return len(records)
+
+
+async def new_path(file: UploadFile) -> int:
+    count = 0
+    async for raw_rows in CSVUploadReader(file).batches():
+        batch = [
+            ComplaintsSchema(**normalize_upload_row(raw_row, UPLOAD_UPPERCASE_FIELDS))
+            for raw_row in raw_rows
+        ]
+        count += len(batch)
+    return count
+
+
+async def pool_path(file: UploadFile) -> int:
+    report = ErrorReport()
+    async for records, errors in validate_batches(
+        CSVUploadReader(file), parse_complaint_row
+    ):
+        report.add(records, errors)
+    return report.rows
+
+
+async def measure(func, path: str):
+    with open(path, "rb") as f:
+        upload = UploadFile(file=f, filename=os.path.basename(path))
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = await func(upload)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "complaints.csv")
+        write_export(path, args.rows)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{args.rows} rows, {size_mb:.1f} MiB CSV")
+        # Start the pool's workers outside the timings
+        await measure(pool_path, path)
+        for label, func in (
+            ("whole file", old_path),
+            ("batches", new_path),
+            ("pool", pool_path),
+        ):
+            rows, elapsed, peak = await measure(func, path)
+            print(
+                f"{label:<12} {rows:>8} rows  {elapsed:7.2f}s  "
+                f"peak {peak / 2**20:8.1f} MiB"
+            )
+    shutdown_validation_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Deterministic synthetic rows shared by seed.py and the upload scenarios in
+run.py. Row i is always the same for a given seed, so the runner can rebuild
+CSVs that match what was seeded without reading the database.
+"""
+
+import random
+from datetime import date, time, timedelta
+
+BENCH_USERNAME = "BENCH ADMIN"
+BENCH_PASSWORD = "benchmark"
+# upload_complaints stamps every row with this creator
+UPLOAD_CREATED_BY = "D Manna"
+
+TECHNICIAN_COUNT = 40
+TODAY = date.today()
+
+DIVISIONS = ["FANS", "PUMP", "LIGHT", "APPLIANCES"]
+COMPLAINT_HEADS = ["CGCEL", "CGPISL"]
+COMPLAINT_TYPES = ["INSTALL", "SERVICE", "DEMO"]
+COMPLAINT_STATUSES = ["NEW", "ASSIGNED", "PENDING", "WIP", "CLOSED", "CANCEL"]
+PRIORITIES = [
+    "NORMAL",
+    "NORMAL",
+    "NORMAL",
+    "ESCALATION",
+    "HO-ESCALATION",
+    "MD-ESCALATION",
+    "CRM-ESCALATION",
+]
+ACTION_HEADS = [
+    "VISIT PENDING",
+    "SPARE PENDING",
+    "UNDER OBSERVATION",
+    "CALL CUSTOMER",
+    "MAIL TO BE SENT TO HO",
+    "REPLACEMENT",
+]
+CUSTOMER_TYPES = ["CUSTOMER", "DEALER"]
+CITIES = ["KOLKATA", "HOWRAH", "DURGAPUR", "ASANSOL", "SILIGURI", "HALDIA"]
+FIRST_NAMES = ["AMIT", "RINA", "SOUMEN", "PRIYA", "RAJESH", "ANITA", "SUBHAS", "MOU"]
+LAST_NAMES = ["DAS", "GHOSH", "SEN", "PAUL", "ROY", "MANNA", "SAHA", "BOSE"]
+SPARE_WORDS = ["MOTOR", "CAPACITOR", "BLADE", "SWITCH", "IMPELLER", "DRIVER", "COIL"]
+
+
+def technician_names():
+    return [f"TECH {index:03d}" for index in range(TECHNICIAN_COUNT)]
+
+
+def _rng(seed: int, kind: str, index: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def complaint_number(index: int) -> str:
+    return f"BM{index:09d}"
+
+
+def spare_code(index: int) -> str:
+    return f"SP{index:07d}"
+
+
+def complaint_row(seed: int, index: int) -> dict:
+    rng = _rng(seed, "complaint", index)
+    opened = TODAY - timedelta(days=rng.randint(0, 730))
+    technician = rng.choice(technician_names())
+    closed = rng.random() < 0.7
+    return {
+        "complaint_number": complaint_number(index),
+        "complaint_head": rng.choice(COMPLAINT_HEADS),
+        "complaint_date": opened,
+        "complaint_time": time(rng.randint(9, 19), rng.randint(0, 59)),
+        "complaint_type": rng.choice(COMPLAINT_TYPES),
+        "complaint_status": "CLOSED" if closed else rng.choice(COMPLAINT_STATUSES),
+        "complaint_priority": rng.choice(PRIORITIES),
+        "action_head": rng.choice(ACTION_HEADS),
+        "action_by": technician,
+        "technician": technician,
+        "customer_type": rng.choice(CUSTOMER_TYPES),
+        "customer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "customer_address1": f"{rng.randint(1, 300)} STATION ROAD",
+        "customer_address2": None,
+        "customer_city": rng.choice(CITIES),
+        "customer_pincode": f"7{rng.randint(0, 99999):05d}",
+        "customer_contact1": f"9{rng.randint(0, 999999999):09d}",
+        "customer_contact2": None,
+        "product_division": rng.choice(DIVISIONS),
+        "product_serial_number": f"SN{rng.randint(0, 10**9):010d}",
+        "product_model": f"MODEL-{rng.randint(1, 400)}",
+        "spare_pending": "Y" if rng.random() < 0.15 else "N",
+        "current_status": "AWAITING VISIT",
+        "created_by": UPLOAD_CREATED_BY,
+        "final_status": "Y" if closed else "N",
+    }
+
+
+def stock_row(seed: int, index: int) -> dict:
+    rng = _rng(seed, "stock", index)
+    return {
+        "spare_code": spare_code(index),
+        "division": rng.choice(DIVISIONS),
+        "spare_description": f"{rng.choice(SPARE_WORDS)} {rng.randint(1, 999)}",
+        "cnf_qty": rng.randint(0, 50),
+        "grc_qty": rng.randint(0, 20),
+        "own_qty": rng.randint(0, 100),
+        "alp": round(rng.uniform(20, 4000), 2),
+        "sale_price": round(rng.uniform(25, 5000), 2),
+        "indent_qty": rng.randint(0, 10),
+        "hsn_code": f"{rng.randint(84000000, 85999999)}",
+    }
+
+
+def movement_row(seed: int, index: int, stock_rows: int) -> dict:
+    rng = _rng(seed, "movement", index)
+    stock = stock_row(seed, rng.randrange(stock_rows))
+    return {
+        "spare_code": stock["spare_code"],
+        "division": stock["division"],
+        "spare_description": stock["spare_description"],
+        "movement_type": rng.choice(["SPARE IN", "SPARE OUT"]),
+        "own_qty": rng.randint(1, 10),
+        "remark": "BENCHMARK",
+        "entry_date": TODAY - timedelta(days=rng.randint(0, 730)),
+        "created_by": BENCH_USERNAME,
+    }
+
+
+def indent_row(seed: int, index: int, stock_rows: int) -> dict:
+    rng = _rng(seed, "indent", index)
+    stock = stock_row(seed, rng.randrange(stock_rows))
+    return {
+        "spare_code": stock["spare_code"],
+        "division": stock["division"],
+        "spare_description": stock["spare_description"],
+        "indent_qty": rng.randint(1, 20),
+        "indent_date": TODAY - timedelta(days=rng.randint(0, 730)),
+        "indent_number": "I" + str(index // 5 + 1).zfill(5),
+        "party_name": f"{rng.choice(LAST_NAMES)} TRADERS",
+        "created_by": BENCH_USERNAME,
+    }
+
+
+def grc_row(seed: int, index: int, stock_rows: int) -> dict:
+    rng = _rng(seed, "grc", index)
+    stock = stock_row(seed, index % stock_rows)
+    issue_qty = rng.randint(1, 10)
+    return {
+        "division": stock["division"],
+        "spare_code": stock["spare_code"],
+        "spare_description": stock["spare_description"],
+        "grc_number": index + 1,
+        "grc_date": TODAY - timedelta(days=rng.randint(0, 730)),
+        "issue_qty": issue_qty,
+        "grc_pending_qty": issue_qty,
+        "actual_pending_qty": issue_qty,
+        "status": "N",
+        "invoice": "N",
+    }
@@ -0,0 +1,131 @@
+"""
+Serialization cost of a complaint enquiry page: the previous path (a
+ComplaintEnquiryResponseSchema per row, response_model validation and
+serialization, stdlib JSONResponse) against plain dicts rendered by
+FastJSONResponse.
+
+Run from backend/src so config.py finds .env:
+    python ../benchmarks/json_serialization.py [--rows 10000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from complaints.schemas import ComplaintEnquiryResponseSchema  # noqa: E402
+from utils.date_utils import format_date_ddmmyyyy  # noqa: E402
+from utils.responses import FastJSONResponse  # noqa: E402
+
+import data  # noqa: E402
+
+
+def fake_rows(count: int):
+    return [SimpleNamespace(**data.complaint_row(42, i)) for i in range(count)]
+
+
+def address(row) -> str:
+    return (
+        row.customer_address1
+        + (", " + row.customer_address2 if row.customer_address2 else "")
+        + ", "
+        + row.customer_city
+        + " - "
+        + row.customer_pincode
+    )
+
+
+response_adapter = TypeAdapter(List[ComplaintEnquiryResponseSchema])
+
+
+def old_path(rows) -> bytes:
+    records = [
+        ComplaintEnquiryResponseSchema(
+            complaint_number=row.complaint_number,
+            complaint_date=format_date_ddmmyyyy(row.complaint_date),
+            complaint_time=row.complaint_time,
+            complaint_status=row.complaint_status,
+            customer_name=row.customer_name,
+            customer_address=address(row),
+            customer_contact1=row.customer_contact1,
+            customer_contact2=row.customer_contact2,
+            product_division=row.product_division,
+            current_status=row.current_status,
+            action_by=row.action_by,
+            product_model=row.product_model,
+            product_serial_number=row.product_serial_number,
+            action_head=row.action_head,
+        )
+        for row in rows
+    ]
+    # What FastAPI does with response_model before handing over to JSONResponse
+    validated = response_adapter.validate_python(records)
+    content = response_adapter.dump_python(validated, mode="json")
+    return JSONResponse(content=content).body
+
+
+def new_path(rows) -> bytes:
+    records = [
+        {
+            "complaint_number": row.complaint_number,
+            "complaint_date": format_date_ddmmyyyy(row.complaint_date),
+            "complaint_time": row.complaint_time,
+            "complaint_status": row.complaint_status,
+            "customer_name": row.customer_name,
+            "customer_address": address(row),
+            "customer_contact1": row.customer_contact1,
+            "customer_contact2": row.customer_contact2,
+            "product_division": row.product_division,
+            "current_status": row.current_status,
+            "action_by": row.action_by,
+            "product_model": row.product_model,
+            "product_serial_number": row.product_serial_number,
+            "action_head": row.action_head,
+        }
+        for row in rows
+    ]
+    return FastJSONResponse(content=records).body
+
+
+def measure(func, rows, repeat: int):
+    func(rows)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = fake_rows(args.rows)
+    old, new = old_path(rows), new_path(rows)
+    assert json.loads(old) == json.loads(new), "payloads differ"
+
+    old_time = measure(old_path, rows, args.repeat)
+    new_time = measure(new_path, rows, args.repeat)
+    print(f"{args.rows} rows, {len(new) // 1024} KiB, median of {args.repeat}")
+    print(f"pydantic + json    {old_time * 1000:8.2f} ms")
+    print(f"dicts + orjson     {new_time * 1000:8.2f} ms")
+    print(
+        f"saved              {(old_time - new_time) * 1000:8.2f} ms "
+        f"({old_time / new_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Latency of unrelated requests while a burst of logins is being verified,
+against a running server seeded with seed.py.
+
+    python benchmarks/login_concurrency.py --base-url http://localhost:8000
+
+A probe loop requests /complaints/action_heads on its own connections, first
+with the server idle and then while --logins logins run at once. With bcrypt on
+the event loop the probes queue behind every hash; with the hashing pool they
+should barely move. Run the server with LOGIN_RATE_LIMIT_ENABLED=false, or
+logins beyond the throttle are refused (reported as 429s) instead of hashed.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import data
+from run import authenticate, percentile
+
+PROBE_PATH = "/complaints/action_heads"
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(PROBE_PATH)
+        latencies.append(time.perf_counter() - start)
+
+
+async def probe_while(client, probes: int, awaitable):
+    """Run probe loops until `awaitable` finishes; (its result, latencies)."""
+    latencies = []
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(probe(client, stop, latencies)) for _ in range(probes)
+    ]
+    try:
+        result = await awaitable
+    finally:
+        stop.set()
+        await asyncio.gather(*tasks)
+    return result, latencies
+
+
+async def login_burst(args) -> tuple:
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.logins),
+    ) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/auth/login",
+                    json={"username": args.username, "password": args.password},
+                )
+                for _ in range(args.logins)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    statuses = [response.status_code for response in responses]
+    return elapsed, statuses
+
+
+def summary(label: str, latencies: list):
+    latencies = sorted(latencies)
+    print(
+        f"{label:<14} {len(latencies):>6} probes  "
+        f"p50 {percentile(latencies, 0.50) * 1000:8.1f}  "
+        f"p99 {percentile(latencies, 0.99) * 1000:8.1f}  "
+        f"max {latencies[-1] * 1000:8.1f} ms"
+    )
+
+
+async def run(args):
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout
+    ) as client:
+        await authenticate(args, client)
+        await client.get(PROBE_PATH)
+
+        _, idle = await probe_while(
+            client, args.probes, asyncio.sleep(args.idle_seconds)
+        )
+        (elapsed, statuses), latencies = await probe_while(
+            client, args.probes, login_burst(args)
+        )
+
+    summary("idle", idle)
+    summary("during logins", latencies)
+    busy = statuses.count(503)
+    limited = statuses.count(429)
+    failed = sum(status >= 400 for status in statuses) - busy - limited
+    print(
+        f"{args.logins} logins in {elapsed:.2f}s: {statuses.count(200)} ok, "
+        f"{busy} busy (503), {limited} rate limited (429), {failed} failed"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default=data.BENCH_USERNAME)
+    parser.add_argument("--password", default=data.BENCH_PASSWORD)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=4, help="probe loops")
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Micro-benchmark: the old Strip + Capitalize BaseHTTPMiddleware pair against
+NormalizeJSONMiddleware, on reallocate (JSON) / RFR report (multipart form,
+as the frontend sends it) sized payloads.
+
+Run from backend/:  python benchmarks/normalize_middleware.py [--complaints N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from middleware.normalize import NormalizeJSONMiddleware  # noqa: E402
+
+
+# The two middlewares as they were before NormalizeJSONMiddleware
+def strip_outer_whitespace(data):
+    if isinstance(data, dict):
+        return {k: strip_outer_whitespace(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [strip_outer_whitespace(item) for item in data]
+    elif isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def capitalize_values(obj):
+    if isinstance(obj, dict):
+        return {k: capitalize_values(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [capitalize_values(item) for item in obj]
+    elif isinstance(obj, str):
+        return obj.upper()
+    return obj
+
+
+def legacy_middleware(transform):
+    class LegacyMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            if request.headers.get("content-type") == "application/json":
+                body_bytes = await request.body()
+                if body_bytes:
+                    try:
+                        data = transform(json.loads(body_bytes))
+                        request._body = json.dumps(data).encode("utf-8")
+                    except json.JSONDecodeError:
+                        pass
+            return await call_next(request)
+
+    return LegacyMiddleware
+
+
+async def endpoint(request: Request):
+    data = await request.json()
+    return JSONResponse({"count": len(data["complaint_numbers"])})
+
+
+async def form_endpoint(request: Request):
+    form = await request.form()
+    return JSONResponse({"count": len(json.loads(form["complaint_numbers"]))})
+
+
+def build_app(legacy: bool):
+    routes = [
+        Route("/complaints/reallocate_complaints", endpoint, methods=["POST"]),
+        Route("/complaints/rfr_report", form_endpoint, methods=["POST"]),
+    ]
+    app = Starlette(routes=routes)
+    if legacy:
+        # Same order as the old register_middleware: Strip ends up outermost
+        app.add_middleware(legacy_middleware(capitalize_values))
+        app.add_middleware(legacy_middleware(strip_outer_whitespace))
+    else:
+        app.add_middleware(NormalizeJSONMiddleware)
+    return app
+
+
+FORM_BOUNDARY = "benchmarkboundary"
+
+
+def multipart_body(fields: dict) -> bytes:
+    parts = [
+        f'--{FORM_BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"'
+        f"\r\n\r\n{value}\r\n"
+        for name, value in fields.items()
+    ]
+    return ("".join(parts) + f"--{FORM_BOUNDARY}--\r\n").encode()
+
+
+def payloads(complaints: int):
+    numbers = [f" cg{index:010d} " for index in range(complaints)]
+    reallocate = {
+        "complaint_numbers": numbers,
+        "old_technician": " ramesh kumar ",
+        "new_technician": " suresh das ",
+    }
+    rfr = {
+        "complaint_numbers": json.dumps(numbers),
+        "product_division": " fans ",
+        "rfr_number": " rfr/0001 ",
+        "rfr_type": " replacement ",
+        "product_type": " ceiling fan ",
+    }
+    return [
+        (
+            "POST",
+            "/complaints/reallocate_complaints",
+            b"application/json",
+            json.dumps(reallocate).encode(),
+        ),
+        (
+            "POST",
+            "/complaints/rfr_report",
+            b"multipart/form-data; boundary=" + FORM_BOUNDARY.encode(),
+            multipart_body(rfr),
+        ),
+    ]
+
+
+
+async def call(app, method: str, path: str, content_type: bytes, body: bytes):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests, iterations: int):
+    for request in requests:
+        await call(app, *request)
+    timings = []
+    for _ in range(iterations):
+        for request in requests:
+            start = time.perf_counter()
+            await call(app, *request)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<8} mean {statistics.mean(timings) * 1000:8.3f} ms   "
+        f"p50 {statistics.median(timings) * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms"
+    )
+    return statistics.mean(timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    requests = payloads(args.complaints)
+    print(
+        f"{args.complaints} complaint numbers per payload, "
+        f"{len(requests[0][3]) // 1024} KiB body, {args.iterations} iterations"
+    )
+    old = report("old", await measure(build_app(True), requests, args.iterations))
+    new = report("new", await measure(build_app(False), requests, args.iterations))
+    print(f"speed-up {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
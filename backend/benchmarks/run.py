@@ -0,0 +1,351 @@
+"""
+Benchmark the hot endpoints of a running server seeded with seed.py.
+
+    python benchmarks/run.py --base-url http://localhost:8000 --save baseline.json
+    python benchmarks/run.py --compare baseline.json
+
+Reports p50/p95/p99 latency and throughput per scenario. --compare exits
+non-zero if any scenario's p95 is more than --threshold slower than the
+baseline. Rate-limited (429) responses are counted apart and left out of the
+timings; run the server with LOGIN_RATE_LIMIT_ENABLED=false so none occur.
+The upload scenarios change data (upload_complaints closes every
+complaint missing from its CSV), so they run last; reseed before the next run.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+import data
+
+UPLOAD_COMPLAINT_COLUMNS = [
+    "complaint_number",
+    "complaint_head",
+    "complaint_date",
+    "complaint_time",
+    "complaint_type",
+    "complaint_status",
+    "complaint_priority",
+    "action_head",
+    "action_by",
+    "technician",
+    "customer_type",
+    "customer_name",
+    "customer_address1",
+    "customer_city",
+    "customer_pincode",
+    "customer_contact1",
+    "product_division",
+    "current_status",
+]
+UPLOAD_STOCK_COLUMNS = [
+    "spare_code",
+    "division",
+    "spare_description",
+    "cnf_qty",
+    "grc_qty",
+    "own_qty",
+    "alp",
+    "sale_price",
+    "indent_qty",
+    "hsn_code",
+]
+# Short, so polling adds little to the measured upload latency
+JOB_POLL_SECONDS = 0.05
+
+
+def to_csv(rows, columns) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+class Scenarios:
+    """Each scenario builds one request; rng picks filters/pages per call."""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        open_complaints = [
+            row
+            for row in (
+                data.complaint_row(args.seed, i) for i in range(args.upload_rows * 4)
+            )
+            if row["final_status"] == "N"
+        ]
+        self.complaints_csv = to_csv(
+            open_complaints[: args.upload_rows], UPLOAD_COMPLAINT_COLUMNS
+        )
+        self.stock_csv = to_csv(
+            (data.stock_row(args.seed, i) for i in range(args.upload_rows)),
+            UPLOAD_STOCK_COLUMNS,
+        )
+
+    async def login(self, client: httpx.AsyncClient):
+        return await client.post(
+            "/auth/login",
+            json={"username": self.args.username, "password": self.args.password},
+        )
+
+    async def complaints_enquiry(self, client: httpx.AsyncClient):
+        params = self.rng.choice(
+            [
+                {"all_complaints": "Y"},
+                {"product_division": self.rng.choice(data.DIVISIONS)},
+                {"customer_name": self.rng.choice(data.LAST_NAMES)},
+                {"escalation_complaints": "Y"},
+                {"spare_pending_complaints": "Y"},
+            ]
+        )
+        params.update(limit=50, offset=self.rng.choice([0, 0, 0, 50, 500, 5000]))
+        return await client.get("/complaints/enquiry", params=params)
+
+    async def menu_dashboard(self, client: httpx.AsyncClient):
+        return await client.get("/menu/dashboard")
+
+    async def grc_print_report(self, client: httpx.AsyncClient):
+        rows = [
+            data.grc_row(self.args.seed, self.rng.randrange(1000), 1000)
+            for _ in range(40)
+        ]
+        payload = {
+            "division": "FANS",
+            "challan_number": "G99999",
+            "sent_through": "BY HAND",
+            "docket_number": "BENCH",
+            "grc_rows": [
+                {
+                    "grc_number": row["grc_number"],
+                    "grc_date": row["grc_date"].isoformat(),
+                    "spare_code": row["spare_code"],
+                    "spare_description": row["spare_description"],
+                    "actual_pending_qty": row["actual_pending_qty"],
+                    "good_qty": row["issue_qty"],
+                    "defective_qty": 0,
+                }
+                for row in rows
+            ],
+        }
+        return await client.post("/grc_cgcel/print_report/All", json=payload)
+
+    async def complaints_upload(self, client: httpx.AsyncClient):
+        files = {"file": ("complaints.csv", self.complaints_csv, "text/csv")}
+        return await wait_for_job(
+            client, await client.post("/complaints/upload", files=files)
+        )
+
+    async def stock_cgcel_upload(self, client: httpx.AsyncClient):
+        files = {"file": ("stock.csv", self.stock_csv, "text/csv")}
+        return await wait_for_job(
+            client, await client.post("/stock_cgcel/upload", files=files)
+        )
+
+
+async def wait_for_job(client: httpx.AsyncClient, response: httpx.Response):
+    """
+    Uploads run as background jobs: poll /jobs/{id} until the job finishes, so
+    upload latencies cover the whole upload. A failed job comes back as a 500.
+    """
+    if response.status_code != 202:
+        return response
+    job = response.json()
+    while job["phase"] not in ("done", "failed"):
+        await asyncio.sleep(JOB_POLL_SECONDS)
+        response = await client.get(f"/jobs/{job['id']}")
+        if response.status_code >= 400:
+            return response
+        job = response.json()
+    if job["phase"] == "failed":
+        return httpx.Response(500, json=job, request=response.request)
+    return response
+
+
+# Read-only scenarios first; uploads mutate the data set
+SCENARIOS = [
+    "login",
+    "complaints_enquiry",
+    "menu_dashboard",
+    "grc_print_report",
+    "complaints_upload",
+    "stock_cgcel_upload",
+]
+# Uploads are heavy; don't hammer them with the full request count
+UPLOAD_SCENARIOS = {"complaints_upload", "stock_cgcel_upload"}
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    # Nearest-rank
+    rank = round(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+async def run_scenario(name, scenarios, client, requests, concurrency):
+    request = getattr(scenarios, name)
+    latencies = []
+    errors = 0
+    limited = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors, limited
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await request(client)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed = time.perf_counter() - start
+            # 429s are cheap refusals; timing them would flatter the scenario
+            if status == 429:
+                limited += 1
+                continue
+            latencies.append(elapsed)
+            errors += status is None or status >= 400
+
+    # Warm-up request, not measured
+    await request(client)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+
+    if not latencies:
+        sys.exit(
+            f"{name}: every request was rate limited (429); run the server "
+            "with LOGIN_RATE_LIMIT_ENABLED=false"
+        )
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rate_limited": limited,
+        "concurrency": concurrency,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+async def authenticate(args, client: httpx.AsyncClient):
+    response = await client.post(
+        "/auth/login", json={"username": args.username, "password": args.password}
+    )
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.cookies['access_token']}"
+
+
+async def run(args):
+    scenarios = Scenarios(args)
+    names = args.scenarios.split(",") if args.scenarios else SCENARIOS
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        await authenticate(args, client)
+        for name in sorted(names, key=SCENARIOS.index):
+            upload = name in UPLOAD_SCENARIOS
+            requests = args.upload_requests if upload else args.requests
+            concurrency = 1 if upload else args.concurrency
+            results[name] = await run_scenario(
+                name, scenarios, client, requests, concurrency
+            )
+            print_result(name, results[name])
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "host": platform.node(),
+        },
+        "results": results,
+    }
+
+
+def print_result(name, result):
+    print(
+        f"{name:<20} {result['requests']:>5} req  {result['errors']:>3} err  "
+        f"{result['rate_limited']:>3} 429  "
+        f"{result['throughput_rps']:>8.1f} rps  p50 {result['p50_ms']:>8.1f}  "
+        f"p95 {result['p95_ms']:>8.1f}  p99 {result['p99_ms']:>8.1f} ms"
+    )
+
+
+def compare(report, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'scenario':<20} {'base p95':>10} {'p95':>10} {'change':>8}")
+    for name, result in report["results"].items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["p95_ms"], result["p95_ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        if result["rate_limited"] or baseline[name].get("rate_limited"):
+            # Different requests were timed in the two runs
+            flag += "  RATE LIMITED"
+        print(f"{name:<20} {before:>10.1f} {after:>10.1f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default=data.BENCH_USERNAME)
+    parser.add_argument("--password", default=data.BENCH_PASSWORD)
+    parser.add_argument("--scenarios", help="comma separated; default all")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--upload-requests", type=int, default=5)
+    parser.add_argument("--upload-rows", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=42, help="same as seed.py")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {args.save}")
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        if regressions:
+            sys.exit(
+                f"\np95 regressed more than {args.threshold:.0%}: "
+                + ", ".join(regressions)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Memory and time of the complaint upload's read/validate stage for the same
+CRM export as CSV and as XLSX, both through upload_reader batches on the
+event loop. The XLSX sheet is streamed by openpyxl in read-only mode, so its
+peak should stay flat like the CSV's rather than grow with the sheet.
+
+Run from backend/src so config.py finds .env:
+    python ../benchmarks/xlsx_ingest.py [--rows 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi import UploadFile  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+
+from complaints.service import parse_complaint_row  # noqa: E402
+from utils.csv_stream import upload_reader  # noqa: E402
+
+import data  # noqa: E402
+from csv_ingest import measure, write_export  # noqa: E402
+from run import UPLOAD_COMPLAINT_COLUMNS  # noqa: E402
+
+
+def write_sheet(path: str, rows: int):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(UPLOAD_COMPLAINT_COLUMNS)
+    for index in range(rows):
+        row = data.complaint_row(42, index)
+        sheet.append([row.get(column) for column in UPLOAD_COMPLAINT_COLUMNS])
+    workbook.save(path)
+
+
+async def read_path(file: UploadFile) -> int:
+    count = 0
+    async for raw_rows in upload_reader(file).batches():
+        batch = [parse_complaint_row(raw_row) for raw_row in raw_rows]
+        count += len(batch)
+    return count
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            "csv": os.path.join(directory, "complaints.csv"),
+            "xlsx": os.path.join(directory, "complaints.xlsx"),
+        }
+        write_export(paths["csv"], args.rows)
+        write_sheet(paths["xlsx"], args.rows)
+        for label, path in paths.items():
+            size_mb = os.path.getsize(path) / 2**20
+            rows, elapsed, peak = await measure(read_path, path)
+            print(
+                f"{label:<6} {size_mb:7.1f} MiB  {rows:>8} rows  {elapsed:7.2f}s  "
+                f"peak {peak / 2**20:8.1f} MiB"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
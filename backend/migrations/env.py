@@ -17,6 +17,7 @@ from src.grc_cgpisl.models import GRCCGPISL, GRCCGPISLDispute, GRCCGPISLReturnHi
 from src.stock_cgcel.models import StockCGCEL, StockCGCELMovement, StockCGCELIndent
 from src.stock_cgpisl.models import StockCGPISL, StockCGPISLIndent
 from src.parameter.models import Parameter
+from src.jobs.models import UploadJob
 from sqlmodel import SQLModel
 from src.config import Config
 
@@ -0,0 +1,96 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+
+from auth.dependencies import AccessTokenBearer, RoleChecker
+from db.db import async_read_engine, get_pool_status, read_replica_enabled
+from metrics.slow_queries import slow_query_log
+from utils.cache import CACHES
+from warmup.service import warmup_report
+
+admin_router = APIRouter()
+access_token_bearer = AccessTokenBearer()
+role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
+
+
+"""
+Live database connection pool statistics.
+"""
+
+
+@admin_router.get(
+    "/pool_status",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def pool_status(_=Depends(access_token_bearer)):
+    pools = {"primary": get_pool_status()}
+    if read_replica_enabled:
+        pools["replica"] = get_pool_status(async_read_engine)
+    return JSONResponse(content=pools)
+
+
+"""
+Result of the startup warm-up: per-step status and timings.
+"""
+
+
+@admin_router.get(
+    "/warmup",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def warmup_status(_=Depends(access_token_bearer)):
+    return JSONResponse(content=warmup_report)
+
+
+"""
+Slowest statement shapes seen since startup, normalized by parameter.
+"""
+
+
+@admin_router.get(
+    "/slow_queries",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def slow_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: Literal["total", "max", "count"] = "total",
+    _=Depends(access_token_bearer),
+):
+    return JSONResponse(content=slow_query_log.top(limit, order_by))
+
+
+"""
+Clear the slow query statistics, e.g. after adding an index.
+"""
+
+
+@admin_router.delete(
+    "/slow_queries",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def reset_slow_queries(_=Depends(access_token_bearer)):
+    slow_query_log.reset()
+    return JSONResponse(content={"message": "Slow query statistics cleared"})
+
+
+"""
+Empty one in-process cache, e.g. after editing holidays directly in the database.
+"""
+
+
+@admin_router.delete(
+    "/caches/{name}",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def clear_cache(name: str, _=Depends(access_token_bearer)):
+    cache = CACHES.get(name)
+    if cache is None:
+        raise HTTPException(status_code=404, detail=f"Unknown cache: {name}")
+    cache.clear()
+    return JSONResponse(content={"message": f"Cache {name} cleared"})
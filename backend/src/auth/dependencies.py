@@ -5,19 +5,93 @@ from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from auth.models import User
+from config import Config
 from db.db import get_session
 from exceptions import (
     AccessDenied,
     AccessTokenRequired,
     InvalidToken,
     RefreshTokenRequired,
+    TooManyLoginAttempts,
 )
+from utils.rate_limit import TokenBucketLimiter
 
-from .service import AuthService
+from .service import AuthService, principal_key
 from .utils import decode_user_token
 
 auth_service = AuthService()
 
+# Failed attempts per username and client: the one that locks out, so a
+# wrong password typed over and over never blocks anyone else
+login_failure_limiter = TokenBucketLimiter(
+    "login_user_client",
+    rate_per_minute=Config.LOGIN_RATE_PER_MINUTE,
+    burst=Config.LOGIN_BURST,
+    lockout_seconds=Config.LOGIN_LOCKOUT_SECONDS,
+    max_lockout_seconds=Config.LOGIN_MAX_LOCKOUT_SECONDS,
+    max_keys=Config.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
+# Failed attempts per client across usernames, against password spraying.
+# Just a rate, no lockout: behind NAT one client is the whole office.
+login_ip_limiter = TokenBucketLimiter(
+    "login_ip",
+    rate_per_minute=Config.LOGIN_IP_RATE_PER_MINUTE,
+    burst=Config.LOGIN_IP_BURST,
+    max_keys=Config.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client's address: the socket peer, unless that is one of
+    TRUSTED_PROXIES, in which case the nearest untrusted X-Forwarded-For hop.
+    """
+    peer = request.client.host if request.client else "unknown"
+    trusted = {proxy.strip() for proxy in Config.TRUSTED_PROXIES.split(",")}
+    if peer not in trusted:
+        return peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for address in reversed(forwarded.split(",")):
+        address = address.strip()
+        if address and address not in trusted:
+            return address
+    return peer
+
+
+def _login_keys(request: Request, username: str):
+    ip = client_ip(request)
+    return (principal_key(username), ip), ip
+
+
+def check_login_rate(request: Request, username: str):
+    """
+    Refuse a password check, before any bcrypt work, while this username and
+    client or this client alone have too many recent failures. Raises
+    TooManyLoginAttempts (429).
+    """
+    if not Config.LOGIN_RATE_LIMIT_ENABLED:
+        return
+    user_key, ip = _login_keys(request, username)
+    retry_after = max(
+        login_failure_limiter.retry_after(user_key),
+        login_ip_limiter.retry_after(ip),
+    )
+    if retry_after:
+        raise TooManyLoginAttempts(retry_after)
+
+
+def record_login_failure(request: Request, username: str):
+    if not Config.LOGIN_RATE_LIMIT_ENABLED:
+        return
+    user_key, ip = _login_keys(request, username)
+    login_failure_limiter.hit(user_key)
+    login_ip_limiter.hit(ip)
+
+
+def clear_login_rate(request: Request, username: str):
+    # A correct password ends this client's backoff for the username
+    login_failure_limiter.reset(_login_keys(request, username)[0])
+
 
 class TokenBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -38,16 +112,11 @@ class TokenBearer(HTTPBearer):
                 token = request.cookies.get("access_token")
         if not token:
             raise InvalidToken()
+        # Raises InvalidToken for a bad signature or an expired token
         token_data = decode_user_token(token)
-        if not self.token_valid(token):
-            raise InvalidToken()
         self.verify_token_data(token_data)
         return token_data
 
-    def token_valid(self, token: str) -> bool:
-        token_data = decode_user_token(token)
-        return token_data is not None
-
     def verify_token_data(self, token_data: dict):
         raise NotImplementedError("Override this method in subclasses")
 
@@ -71,7 +140,7 @@ async def get_current_user(
     session: AsyncSession = Depends(get_session),
 ):
     username = token_data["user"]["username"]
-    return await auth_service.get_user_by_username(username, session)
+    return await auth_service.get_principal(username, session)
 
 
 class RoleChecker:
@@ -1,13 +1,20 @@
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from auth.dependencies import AccessTokenBearer, RefreshTokenBearer
+from auth.dependencies import (
+    AccessTokenBearer,
+    RefreshTokenBearer,
+    check_login_rate,
+    clear_login_rate,
+    record_login_failure,
+)
 from auth.service import AuthService
+from config import Config
 from db.db import get_session
-from exceptions import InvalidToken
+from exceptions import InvalidCredentials, InvalidToken, UserNotFound
 
 from .schemas import UserChangePassword, UserLogin, UserResponse
 from .utils import create_user_token
@@ -26,8 +33,16 @@ refresh_token_bearer = RefreshTokenBearer()
 
 
 @auth_router.post("/login", status_code=status.HTTP_200_OK)
-async def login(user: UserLogin, session: AsyncSession = Depends(get_session)):
-    login_result = await auth_service.login(user, session)
+async def login(
+    user: UserLogin, request: Request, session: AsyncSession = Depends(get_session)
+):
+    check_login_rate(request, user.username)
+    try:
+        login_result = await auth_service.login(user, session)
+    except (InvalidCredentials, UserNotFound):
+        record_login_failure(request, user.username)
+        raise
+    clear_login_rate(request, user.username)
     valid_user = login_result["user"]
     birthday_names = login_result["birthday_names"]
     holiday = login_result["holiday"]
@@ -51,8 +66,8 @@ async def login(user: UserLogin, session: AsyncSession = Depends(get_session)):
         key="access_token",
         value=access_token,
         httponly=True,
-        secure=False,  # Set to True in production (requires HTTPS)
-        samesite="lax",  # Or 'strict' or 'none' as needed
+        secure=Config.COOKIE_SECURE,
+        samesite=Config.COOKIE_SAMESITE,
         max_age=3600 * 3,  # 1 hour
         path="/",
     )
@@ -61,8 +76,8 @@ async def login(user: UserLogin, session: AsyncSession = Depends(get_session)):
         key="refresh_token",
         value=refresh_token,
         httponly=True,
-        secure=False,  # Set to True in production
-        samesite="lax",
+        secure=Config.COOKIE_SECURE,
+        samesite=Config.COOKIE_SAMESITE,
         max_age=3600 * 6 * REFRESH_TOKEN_EXPIRY_DAYS,
         path="/",
     )
@@ -78,8 +93,13 @@ async def login(user: UserLogin, session: AsyncSession = Depends(get_session)):
 async def logout():
     response = JSONResponse(content={"message": "User logged out successfully."})
     # Clear the cookies
-    response.delete_cookie(key="access_token", path="/")
-    response.delete_cookie(key="refresh_token", path="/")
+    for key in ("access_token", "refresh_token"):
+        response.delete_cookie(
+            key=key,
+            path="/",
+            secure=Config.COOKIE_SECURE,
+            samesite=Config.COOKIE_SAMESITE,
+        )
     return response
 
 
@@ -120,8 +140,8 @@ async def refresh_token(token_data=Depends(refresh_token_bearer)):
             key="access_token",
             value=new_access_token,
             httponly=True,
-            secure=False,  # Set to True in production
-            samesite="lax",
+            secure=Config.COOKIE_SECURE,
+            samesite=Config.COOKIE_SAMESITE,
             max_age=3600 * 3,  # 1 hour
             path="/",
         )
@@ -137,10 +157,16 @@ Check whether password matches and change to new password.
 @auth_router.post("/reset_password", status_code=status.HTTP_200_OK)
 async def reset_password(
     user: UserChangePassword,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    user = await auth_service.reset_password(user, session)
+    check_login_rate(request, user.username)
+    try:
+        user = await auth_service.reset_password(user, session)
+    except InvalidCredentials:
+        record_login_failure(request, user.username)
+        raise
     return JSONResponse(
         content={"message": f"User {user.username} password changed successfully."}
     )
@@ -7,13 +7,37 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
 
+from config import Config
 from employee.models import Employee
 from exceptions import InvalidCredentials, UserNotFound
 from holiday.models import Holiday
+from utils.cache import TTLCache
+from utils.etag import table_versions
 
 from .models import User
 from .schemas import UserChangePassword, UserCreate, UserLogin
-from .utils import generate_hash_password, verify_password
+from .utils import (
+    generate_hash_password,
+    verify_and_update_password,
+    verify_password,
+)
+
+# Active users by normalized username, for get_current_user / RoleChecker
+principal_cache = TTLCache(
+    "principal",
+    maxsize=Config.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=Config.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# Birthdays and holidays shown at login; keyed by day and the table versions,
+# expiring after LOGIN_CONTEXT_CACHE_TTL_SECONDS
+login_context_cache = TTLCache("login_context", maxsize=8, ttl=24 * 3600)
+
+
+def principal_key(username: str) -> str:
+    # Same normalization as get_user_by_username; ilike ignores case
+    return " ".join(username.split()).lower()
 
 
 class AuthService:
@@ -22,10 +46,49 @@ class AuthService:
         existing_user = await self.get_user_by_username(user.username, session)
         if not existing_user:
             raise UserNotFound()
-        if not verify_password(user.password, existing_user.password):
+        valid, new_hash = await verify_and_update_password(
+            user.password, existing_user.password
+        )
+        if not valid:
             raise InvalidCredentials()
+        if new_hash:
+            # Stored with an outdated cost; upgrade while we have the password
+            existing_user.password = new_hash
+            session.add(existing_user)
+            await session.commit()
+
+        login_context = await self.get_login_context(session)
+        return {"user": existing_user, **login_context}
+
+    async def get_login_context(self, session: AsyncSession) -> dict:
+        """
+        Today's birthday names and holidays, reused for at most
+        LOGIN_CONTEXT_CACHE_TTL_SECONDS and never past midnight or 3 PM
+        (when tomorrow's holiday starts to show). Writes to employees or
+        holidays through this worker change the key; other workers pick
+        them up when the entry expires.
+        """
+        now = datetime.now()
+        key = (
+            now.date(),
+            now.time() >= time(15, 0),
+            table_versions("employees", "holidays"),
+        )
+        login_context = login_context_cache.get(key)
+        if login_context is None:
+            login_context = await self._build_login_context(session, now)
+            midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+            login_context_cache.set(
+                key,
+                login_context,
+                ttl=min(
+                    (midnight - now).total_seconds(),
+                    Config.LOGIN_CONTEXT_CACHE_TTL_SECONDS,
+                ),
+            )
+        return login_context
 
-        today = datetime.now()
+    async def _build_login_context(self, session: AsyncSession, today: datetime):
         # Prepare queries
         birthday_stmt = select(Employee.name).where(
             Employee.is_active == "Y",
@@ -63,11 +126,7 @@ class AuthService:
                         {"name": row[0], "details": row[1]} for row in holiday_rows
                     ]
 
-        return {
-            "user": existing_user,
-            "birthday_names": birthday_names,
-            "holiday": holidays,
-        }
+        return {"birthday_names": birthday_names, "holiday": holidays}
 
     async def get_user_by_username(self, username: str, session: AsyncSession):
         # Normalize username spacing
@@ -79,16 +138,34 @@ class AuthService:
         result = await session.execute(statement)
         return result.scalars().first()
 
+    async def get_principal(self, username: str, session: AsyncSession):
+        """
+        get_user_by_username through principal_cache. The cached User is a
+        detached copy without the password hash; never add it to a session.
+        """
+        key = principal_key(username)
+        principal = principal_cache.get(key)
+        if principal is None:
+            user = await self.get_user_by_username(username, session)
+            if user is None:
+                return None
+            principal = User(**user.model_dump())
+            principal_cache.set(key, principal)
+        return principal
+
     async def reset_password(
         self, user_data: UserChangePassword, session: AsyncSession
     ):
         existing_user = await self.get_user_by_username(user_data.username, session)
-        if existing_user and verify_password(
+        if existing_user and await verify_password(
             user_data.old_password, existing_user.password
         ):
-            existing_user.password = generate_hash_password(user_data.new_password)
+            existing_user.password = await generate_hash_password(
+                user_data.new_password
+            )
             session.add(existing_user)
             await session.commit()
+            principal_cache.pop(principal_key(existing_user.username))
             return existing_user
         raise InvalidCredentials()
 
@@ -101,13 +178,14 @@ class AuthService:
             "password": "123456",
         }
         new_user = User(**user_data)
-        new_user.password = generate_hash_password(user_data["password"])
+        new_user.password = await generate_hash_password(user_data["password"])
         session.add(new_user)
         try:
             await session.commit()
         except Exception:
             await session.rollback()
             raise
+        principal_cache.pop(principal_key(new_user.username))
         return new_user
 
     async def delete_user(self, username: str, session: AsyncSession):
@@ -115,3 +193,4 @@ class AuthService:
         user_to_delete.is_active = "N"
         session.add(user_to_delete)
         await session.commit()
+        principal_cache.pop(principal_key(user_to_delete.username))
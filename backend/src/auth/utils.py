@@ -1,24 +1,75 @@
+import asyncio
+import hashlib
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Optional, Tuple
 
 import jwt
 from passlib.context import CryptContext
 
 from config import Config
-from exceptions import InvalidToken
+from exceptions import AuthServiceBusy, InvalidToken
+from utils.cache import TTLCache
 
-password_context = CryptContext(schemes=["bcrypt"])
+password_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__default_rounds=Config.BCRYPT_ROUNDS,
+    # Any other cost counts as outdated and is re-hashed on the next login
+    bcrypt__min_rounds=Config.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=Config.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so hashing in threads keeps the event loop free
+_hash_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hashes_in_flight = 0
 
 ACCESS_TOKEN_EXPIRY = timedelta(hours=3)
 
+# Verified payloads by sha256 of the token; each entry expires with its token
+token_cache = TTLCache(
+    "token",
+    maxsize=Config.TOKEN_CACHE_MAX_SIZE,
+    ttl=ACCESS_TOKEN_EXPIRY.total_seconds(),
+)
+
+
+async def _run_hashing(func, *args):
+    """
+    Run a bcrypt call on the hashing pool. Beyond PASSWORD_HASH_QUEUE_LIMIT
+    waiting calls, fail fast with AuthServiceBusy instead of queueing.
+    """
+    global _hashes_in_flight
+    limit = Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_QUEUE_LIMIT
+    if _hashes_in_flight >= limit:
+        raise AuthServiceBusy()
+    _hashes_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, partial(func, *args))
+    finally:
+        _hashes_in_flight -= 1
+
 
-def generate_hash_password(password: str) -> str:
-    hash = password_context.hash(password)
-    return hash
+async def generate_hash_password(password: str) -> str:
+    return await _run_hashing(password_context.hash, password)
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return password_context.verify(password, hashed_password)
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run_hashing(password_context.verify, password, hashed_password)
+
+
+async def verify_and_update_password(
+    password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when the stored hash is outdated."""
+    return await _run_hashing(
+        password_context.verify_and_update, password, hashed_password
+    )
 
 
 def create_user_token(user_data: dict, expiry: timedelta = None, refresh: bool = False):
@@ -37,6 +88,19 @@ def create_user_token(user_data: dict, expiry: timedelta = None, refresh: bool =
 
 
 def decode_user_token(token: str) -> dict:
+    """
+    Verified payload of `token`. A token seen before is served from
+    token_cache, skipping signature verification until it expires.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    token_data = token_cache.get(key)
+    if token_data is None:
+        token_data = _decode_user_token(token)
+        token_cache.set(key, token_data, ttl=token_data["exp"] - time.time())
+    return token_data
+
+
+def _decode_user_token(token: str) -> dict:
     try:
         token_data = jwt.decode(
             jwt=token,
@@ -1,12 +1,44 @@
 from datetime import date, time
 
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlmodel import Column, Field, SQLModel
 
+# Searched by substring from the enquiry; pg_trgm GIN indexes serve ILIKE '%x%'
+TRIGRAM_SEARCH_COLUMNS = (
+    "complaint_number",
+    "customer_contact1",
+    "customer_contact2",
+    "customer_name",
+    "product_serial_number",
+)
+
 
 class Complaint(SQLModel, table=True):
     __tablename__ = "complaints"
+    __table_args__ = (
+        # Lets the upload's close step visit only open complaints
+        Index(
+            "ix_complaints_open",
+            "complaint_number",
+            postgresql_where=text("final_status = 'N'"),
+        ),
+        # Keyset pagination of the enquiry, in its ORDER BY
+        Index("ix_complaints_date_number", "complaint_date", "complaint_number"),
+        *(
+            Index(
+                f"ix_complaints_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in TRIGRAM_SEARCH_COLUMNS
+        ),
+        # Whole phone numbers are matched with =, which gin_trgm_ops only
+        # serves from pg_trgm 1.6 (PostgreSQL 14)
+        Index("ix_complaints_customer_contact1", "customer_contact1"),
+        Index("ix_complaints_customer_contact2", "customer_contact2"),
+    )
 
     # Primary identification
     complaint_number: str = Field(
@@ -108,6 +140,9 @@ class Complaint(SQLModel, table=True):
     # Final status
     final_status: str = Field(sa_column=Column(pg.CHAR(1), nullable=False, default="N"))
 
+    # md5 of the CRM-owned columns as last uploaded; see CRM_OWNED_COLUMNS
+    crm_fingerprint: str = Field(sa_column=Column(pg.VARCHAR(32), nullable=True))
+
     def __repr__(self):
         return f"<Complaint {self.complaint_number}>"
 
@@ -1,7 +1,7 @@
 import json
 import token
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 
 from fastapi import (
     APIRouter,
@@ -11,6 +11,7 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
@@ -20,6 +21,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from auth.dependencies import AccessTokenBearer, RoleChecker
 from complaints.schemas import (
     ComplaintCreateData,
+    ComplaintEnquiryPage,
     ComplaintEnquiryResponseSchema,
     ComplaintFilterData,
     ComplaintReallocateRequestSchema,
@@ -34,8 +36,11 @@ from complaints.schemas import (
     GenerateRFRResponseSchema,
 )
 from complaints.service import ComplaintsService
-from db.db import get_session
-from exceptions import ComplaintClosed
+from db.db import get_read_session, get_session
+from exceptions import ComplaintClosed, InvalidCursor
+from jobs.service import submit_upload
+from utils.etag import etag_headers, not_modified, reference_etag
+from utils.responses import FastJSONResponse
 
 complaints_router = APIRouter()
 complaints_service = ComplaintsService()
@@ -44,83 +49,51 @@ role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
 
 
 """
-Upload Complaints data via CSV file - all
+Upload Complaints data via CSV or XLSX file - all
+Runs as a background job; poll /jobs/{id} with the returned id for progress
+and the result. With dry_run, only validate and report every error found;
+nothing is written.
 """
 
 
 @complaints_router.post(
     "/upload",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[role_checker],
 )
 async def upload_complaints(
-    session: AsyncSession = Depends(get_session),
     file: UploadFile = File(...),
+    dry_run: bool = False,
     _=Depends(access_token_bearer),
 ):
-    try:
-        result = await complaints_service.upload_complaints(session, file)
-    except Exception as exc:
-        return JSONResponse(
-            content={
-                "message": "Processing failed",
-                "resolution": str(exc),
-                "type": "error",
-            },
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    if result.get("type") in ("warning", "error"):
-        return JSONResponse(
-            content=result,
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
-
-    # Success
-    return JSONResponse(
-        content=result,
-        status_code=status.HTTP_200_OK,
+    job = await submit_upload(
+        "complaints", file, complaints_service.upload_complaints, dry_run
     )
+    return FastJSONResponse(content=job.as_dict(), status_code=status.HTTP_202_ACCEPTED)
 
 
 """
-Upload Complaints data via CSV file - only NEW
+Upload Complaints data via CSV or XLSX file - only NEW
+Runs as a background job; poll /jobs/{id} with the returned id for progress
+and the result. With dry_run, only validate and report every error found;
+nothing is written.
 """
 
 
 @complaints_router.post(
     "/upload_new",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[role_checker],
 )
 async def upload_new_complaints(
-    session: AsyncSession = Depends(get_session),
     file: UploadFile = File(...),
+    dry_run: bool = False,
     _=Depends(access_token_bearer),
 ):
-    try:
-        result = await complaints_service.upload_new_complaints(session, file)
-    except Exception as exc:
-        return JSONResponse(
-            content={
-                "message": "Processing failed",
-                "resolution": str(exc),
-                "type": "error",
-            },
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    if result.get("type") in ("warning", "error"):
-        return JSONResponse(
-            content=result,
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
-
-    # Success
-    return JSONResponse(
-        content=result,
-        status_code=status.HTTP_200_OK,
+    job = await submit_upload(
+        "new_complaints", file, complaints_service.upload_new_complaints, dry_run
     )
+    return FastJSONResponse(content=job.as_dict(), status_code=status.HTTP_202_ACCEPTED)
 
 
 """
@@ -133,25 +106,34 @@ Get list of action heads.
     status_code=status.HTTP_200_OK,
 )
 async def get_action_heads(
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("action")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     result = await complaints_service.get_action_heads(session)
     return JSONResponse(
         content={"action_heads": result},
+        headers=etag_headers(etag),
     )
 
 
 """
 Complaint enquiry using query parameters.
-
+Pages by limit/offset, or by cursor: pass cursor= (empty) for the first page,
+then each response's next_cursor until it is null.
+return_total adds total_records: exact (COUNT), cached (an exact count of the
+same filters, reused briefly) or estimated (planner estimate, no scan).
 """
 
 
 @complaints_router.get(
     "/enquiry",
     status_code=status.HTTP_200_OK,
-    response_model=List[ComplaintEnquiryResponseSchema],
+    response_model=Union[List[ComplaintEnquiryResponseSchema], ComplaintEnquiryPage],
 )
 async def enquiry_complaint(
     product_division: Optional[str] = None,
@@ -174,7 +156,9 @@ async def enquiry_complaint(
     mail_to_be_sent_complaints: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    session: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = None,
+    return_total: Optional[Literal["exact", "cached", "estimated"]] = None,
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     try:
@@ -200,10 +184,23 @@ async def enquiry_complaint(
             mail_to_be_sent_complaints,
             limit,
             offset,
+            cursor,
+            return_total,
         )
-        return result
+        # Rows are already plain dicts; skip response_model re-validation.
+        # With a cursor or return_total this is the {"records", ...} page
+        return FastJSONResponse(content=result)
+    except InvalidCursor:
+        raise
     except:
-        return []
+        if cursor is None and not return_total:
+            return []
+        page = {"records": []}
+        if cursor is not None:
+            page["next_cursor"] = None
+        if return_total:
+            page["total_records"] = 0
+        return FastJSONResponse(content=page)
 
 
 """
@@ -217,7 +214,7 @@ Get complaint filter data.
     response_model=ComplaintFilterData,
 )
 async def get_complaint_filter_data(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await complaints_service.get_complaint_filter_data(session)
@@ -234,12 +231,18 @@ List of employees.
     status_code=status.HTTP_200_OK,
 )
 async def list_of_employees(
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("employees")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     result = await complaints_service.get_employees(session)
     return JSONResponse(
         content={"employees": result},
+        headers=etag_headers(etag),
     )
 
 
@@ -255,7 +258,7 @@ Complaint Data for Reallocation
 )
 async def get_complaint_reallocation_data(
     allocated_to: str,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await complaints_service.get_complaint_reallocation_data(
@@ -408,7 +411,7 @@ List technicians and emails
     status_code=status.HTTP_200_OK,
 )
 async def get_technician_email_list(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await complaints_service.get_technician_email_list(session)
@@ -425,11 +428,11 @@ List all complaints
     status_code=status.HTTP_200_OK,
 )
 async def list_all_complaints(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await complaints_service.list_all_complaints(session)
-    return JSONResponse(
+    return FastJSONResponse(
         content={"complaints": result},
     )
 
@@ -501,7 +504,7 @@ Get Generate RFR by division
 )
 async def get_generate_rfr_data(
     product_division: str,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await complaints_service.get_generate_rfr_data(session, product_division)
@@ -61,6 +61,13 @@ class ComplaintEnquiryResponseSchema(BaseModel):
     action_head: str
 
 
+class ComplaintEnquiryPage(BaseModel):
+    # next_cursor is sent with a cursor, total_records with return_total
+    records: List[ComplaintEnquiryResponseSchema]
+    next_cursor: Optional[str] = None
+    total_records: Optional[int] = None
+
+
 class ComplaintTechniciansReallocationSchema(BaseModel):
     complaint_number: str
     complaint_date: str
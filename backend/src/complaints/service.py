@@ -1,20 +1,19 @@
-import csv
-import io
 import os
+import re
 from datetime import date, datetime
 from typing import Any, List, Optional, Union
 
 from fastapi import UploadFile
 from pydantic import ValidationError
-from sqlalchemy import case, distinct, func, insert, select, tuple_, update
+from sqlalchemy import case, distinct, exists, func, select, text, tuple_, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import func
 
 from complaints.models import ActionTable, Complaint
 from complaints.schemas import (
     ComplaintCreateData,
-    ComplaintEnquiryResponseSchema,
     ComplaintFilterData,
     ComplaintReallocateRequestSchema,
     ComplaintsSchema,
@@ -28,6 +27,7 @@ from complaints.schemas import (
     NewComplaintsSchema,
     UpdateComplaint,
 )
+from config import Config
 from customer.models import Customer
 from employee.models import Employee
 from exceptions import (
@@ -35,151 +35,265 @@ from exceptions import (
     ComplaintNumberAlreadyExists,
     ComplaintNumberGenerationFailed,
     EmailSendingFailed,
+    InvalidCursor,
     UpdateFailed,
 )
+from jobs.service import report_progress
 from mail import create_email_message, mail
 from parameter.models import Parameter
+from utils.bulk import bulk_copy, bulk_insert, create_staging_table, quote_columns
+from utils.cache import TTLCache
+from utils.csv_stream import upload_reader
 from utils.date_utils import format_date_ddmmyyyy
+from utils.etag import note_written, table_versions
+from utils.explain import estimated_count
 from utils.file_utils import capital_to_proper_case
+from utils.pagination import decode_cursor, encode_cursor
+from utils.validation import ErrorReport, validate_batches
+
+# Fields to convert to uppercase
+UPLOAD_UPPERCASE_FIELDS = {
+    "complaint_number",
+    "complaint_head",
+    "complaint_type",
+    "complaint_status",
+    "complaint_priority",
+    "customer_type",
+    "customer_name",
+    "customer_address1",
+    "customer_address2",
+    "customer_city",
+    "product_division",
+    "current_status",
+}
+NEW_UPLOAD_UPPERCASE_FIELDS = UPLOAD_UPPERCASE_FIELDS | {
+    "product_model",
+    "product_serial_number",
+}
+
+# Temp table the daily CRM sync is COPYed into before merging
+UPLOAD_STAGING_TABLE = "complaints_upload_stage"
+
+# Columns the CRM owns. Existing complaints pick up CRM-side changes to these
+# (and only these) when the fingerprint of the uploaded values changes, so
+# fields staff maintain in the app, complaint_head and complaint_type among
+# them, are never overwritten by a re-upload.
+# Keep in sync with the backfill in migration 5b7c2e9d41f3.
+CRM_OWNED_COLUMNS = (
+    "complaint_status",
+    "complaint_priority",
+    "current_status",
+)
 
 
-class ComplaintsService:
+def crm_owned_columns(columns: List[str]) -> List[str]:
+    return [column for column in CRM_OWNED_COLUMNS if column in columns]
 
-    async def upload_complaints(self, session: AsyncSession, file: UploadFile):
-        content = await file.read()
-        try:
-            text = content.decode("utf-8-sig")
-        except Exception:
-            text = content.decode("utf-8", errors="ignore")
 
-        reader = csv.DictReader(io.StringIO(text))
+def crm_fingerprint_sql(
+    columns: List[str], staged: str, existing: Optional[str] = None
+) -> str:
+    """
+    Fingerprint of every CRM_OWNED_COLUMNS value, as the migration backfills
+    it: the staged value where the CSV has the column, else the `existing`
+    complaint's (NULL without one), so a CSV lacking a column neither flags
+    nor rewrites rows.
+    """
+    values = []
+    for column in CRM_OWNED_COLUMNS:
+        if column in columns:
+            values.append(f"{staged}.{column}")
+        else:
+            values.append(f"{existing}.{column}" if existing else "NULL")
+    return f"md5(ROW({', '.join(values)})::text)"
 
-        if not reader.fieldnames:
-            return {
-                "message": "Invalid file",
-                "resolution": "CSV file has no headers",
-                "type": "warning",
-            }
 
-        records = []
-        line_no = 1
-
-        # Fields to convert to uppercase
-        uppercase_fields = [
-            "complaint_number",
-            "complaint_head",
-            "complaint_type",
-            "complaint_status",
-            "complaint_priority",
-            "customer_type",
-            "customer_name",
-            "customer_address1",
-            "customer_address2",
-            "customer_city",
-            "product_division",
-            "current_status",
-        ]
+# Exact enquiry totals by the count query and the complaints table version,
+# so a committed complaint write in this process makes every entry stale
+enquiry_count_cache = TTLCache(
+    "enquiry_count",
+    maxsize=Config.ENQUIRY_COUNT_CACHE_MAX_SIZE,
+    ttl=Config.ENQUIRY_COUNT_CACHE_TTL_SECONDS,
+)
 
-        for raw_row in reader:
-            line_no += 1
-
-            # Normalize CSV headers to snake_case-like keys
-            row = {}
-            for k, v in raw_row.items():
-                key = (k or "").strip().lower()
-                val = v.strip() if v else ""
-                # Convert to uppercase if field is in uppercase_fields and value is not None
-                if key in uppercase_fields and val != "":
-                    row[key] = val.upper()
-                else:
-                    row[key] = val if val != "" else None
+# A whole mobile number; customer_contact1/2 are VARCHAR(10), so one can only
+# match them exactly
+PHONE_NUMBER = re.compile(r"[0-9]{10}")
+
+
+def contains(column, value: str):
+    """
+    Case-insensitive substring match of `value` on `column`, with LIKE
+    wildcards in it matched literally. The column's pg_trgm index serves it
+    once `value` is three or more characters long.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def normalize_upload_row(raw_row: dict, uppercase_fields: set) -> dict:
+    # Normalize CSV headers to snake_case-like keys
+    row = {}
+    for k, v in raw_row.items():
+        key = (k or "").strip().lower()
+        val = v.strip() if v else ""
+        # Convert to uppercase if field is in uppercase_fields and value is not None
+        if key in uppercase_fields and val != "":
+            row[key] = val.upper()
+        else:
+            row[key] = val if val != "" else None
 
-            # Override / ensure defaults required by the user
-            row["spare_pending"] = "N"
-            row["created_by"] = "D Manna"
-            row["final_status"] = "N"
+    # Override / ensure defaults required by the user
+    row["spare_pending"] = "N"
+    row["created_by"] = "D Manna"
+    row["final_status"] = "N"
+    return row
 
-            try:
-                validated = ComplaintsSchema(**row)
-            except ValidationError as ve:
-                return {
-                    "message": f"Validation failed for {row.get('complaint_number')}",
-                    "resolution": str(ve),
-                    "type": "warning",
-                }
 
-            records.append(validated)
+def parse_complaint_row(raw_row: dict) -> dict:
+    row = normalize_upload_row(raw_row, UPLOAD_UPPERCASE_FIELDS)
+    return ComplaintsSchema(**row).dict(exclude_unset=True)
+
 
-        if not records:
+def parse_new_complaint_row(raw_row: dict) -> dict:
+    row = normalize_upload_row(raw_row, NEW_UPLOAD_UPPERCASE_FIELDS)
+    return NewComplaintsSchema(**row).dict(exclude_unset=True)
+
+
+class ComplaintsService:
+
+    async def upload_complaints(
+        self, session: AsyncSession, file: UploadFile, dry_run: bool = False
+    ):
+        reader = upload_reader(file)
+        if not await reader.fieldnames():
             return {
-                "message": "Uploaded Successfully",
-                "resolution": "No valid rows found",
+                "message": "Invalid file",
+                "resolution": "CSV/XLSX file has no headers",
+                "type": "warning",
             }
 
-        # Use complaint_number as key for insert-only behavior: ignore CSV rows
-        # that already exist in DB. New complaint_numbers will be inserted.
-        keys = [r.complaint_number for r in records]
-
-        # All complaint numbers already in DB
-        all_db_result = await session.execute(select(Complaint.complaint_number))
-        all_db_keys = {r[0] for r in all_db_result.all()}
-
-        to_insert = []
-        to_reopen = []
-
-        # Determine which columns are present in the CSV (excluding complaint_number)
-        present_fields = set()
-        for r in records:
-            present_fields.update(r.dict(exclude_unset=True).keys())
-        present_fields.discard("complaint_number")
-
-        for r in records:
-            key = r.complaint_number
-            if key in all_db_keys:
-                # If complaint exists in DB, ignore this CSV record
-                to_reopen.append(key)
-                continue
-
-            data_dict = {
-                k: v
-                for k, v in r.dict(exclude_unset=False).items()
-                if k == "complaint_number" or k in present_fields
-            }
-            to_insert.append(data_dict)
-
-        # Determine DB complaint_numbers (not starting with 'N') missing from CSV
-        csv_keys_set = set(keys)
-        to_close = [
-            k
-            for k in all_db_keys
-            if (not k.startswith("N")) and (k not in csv_keys_set)
-        ]
+        table = Complaint.__table__
+        columns = None
+        staged = 0
+        report = ErrorReport()
+
+        # Batches are validated on the process pool and COPYed into a temp
+        # staging table as they come back, then merged with set-based
+        # statements, all in one transaction. After the first bad row nothing
+        # more is staged, but validation runs to the end so the report lists
+        # every error; then everything is rolled back (the staging table too).
+        try:
+            async for records, errors in validate_batches(reader, parse_complaint_row):
+                report.add(records, errors)
+                if dry_run or report or not records:
+                    continue
+
+                # Every row carries the same CSV columns, so the set fields
+                # (and hence the staged columns) match across rows
+                if columns is None:
+                    columns = list(records[0][1])
+                    await create_staging_table(
+                        session, UPLOAD_STAGING_TABLE, table.name, columns
+                    )
+                staged += await bulk_copy(
+                    session, UPLOAD_STAGING_TABLE, [values for _, values in records]
+                )
 
-        inserted = 0
-        updated = 0
+            if dry_run:
+                return report.response()
+            if report:
+                await session.rollback()
+                return report.response()
 
-        table = Complaint.__table__
+            if not staged:
+                return {
+                    "message": "Uploaded Successfully",
+                    "resolution": "No valid rows found",
+                }
 
-        try:
-            if to_insert:
-                await session.execute(insert(table).values(to_insert))
-                inserted = len(to_insert)
-
-            if to_close:
-                await session.execute(
-                    update(table)
-                    .where(table.c.complaint_number.in_(to_close))
-                    .values(final_status="Y")
+            report_progress(phase="writing")
+            # Temp tables are never auto-analyzed; give the planner row counts
+            await session.execute(text(f"ANALYZE {UPLOAD_STAGING_TABLE}"))
+            column_list = quote_columns(session, columns)
+            staged_columns = quote_columns(session, columns, "s")
+            owned = crm_owned_columns(columns)
+            fingerprint = crm_fingerprint_sql(columns, "s", "c")
+            new_fingerprint = crm_fingerprint_sql(columns, "s")
+
+            # New complaint_numbers are inserted with their fingerprint
+            inserted = await session.scalar(
+                text(
+                    f"""
+                    WITH inserted AS (
+                        INSERT INTO complaints ({column_list}, crm_fingerprint)
+                        SELECT {staged_columns}, {new_fingerprint}
+                        FROM {UPLOAD_STAGING_TABLE} s
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM complaints c
+                            WHERE c.complaint_number = s.complaint_number
+                        )
+                        RETURNING 1
+                    )
+                    SELECT count(*) FROM inserted
+                    """
+                )
+            )
+
+            # Existing complaints whose CRM-owned values changed since the last
+            # upload; everything else about them is left alone
+            changed = 0
+            if owned:
+                assignments = ", ".join(f"{column} = s.{column}" for column in owned)
+                changed = await session.scalar(
+                    text(
+                        f"""
+                        WITH changed AS (
+                            UPDATE complaints c
+                            SET {assignments}, crm_fingerprint = {fingerprint}
+                            FROM {UPLOAD_STAGING_TABLE} s
+                            WHERE c.complaint_number = s.complaint_number
+                            AND c.crm_fingerprint IS DISTINCT FROM {fingerprint}
+                            RETURNING 1
+                        )
+                        SELECT count(*) FROM changed
+                        """
+                    )
+                )
+            unchanged = staged - inserted - changed
+
+            # Open complaints (not starting with 'N') missing from the CSV
+            closed = await session.scalar(
+                text(
+                    f"""
+                    WITH closed AS (
+                        UPDATE complaints c SET final_status = 'Y'
+                        WHERE c.final_status = 'N'
+                        AND c.complaint_number NOT LIKE 'N%'
+                        AND NOT EXISTS (
+                            SELECT 1 FROM {UPLOAD_STAGING_TABLE} s
+                            WHERE s.complaint_number = c.complaint_number
+                        )
+                        RETURNING 1
+                    )
+                    SELECT count(*) FROM closed
+                    """
                 )
-                updated += len(to_close)
+            )
 
-            if to_reopen:
-                await session.execute(
-                    update(table)
-                    .where(table.c.complaint_number.in_(to_reopen))
-                    .values(final_status="N")
+            await session.execute(
+                text(
+                    f"""
+                    UPDATE complaints c SET final_status = 'N'
+                    FROM {UPLOAD_STAGING_TABLE} s
+                    WHERE c.complaint_number = s.complaint_number
+                    AND c.final_status <> 'N'
+                    """
                 )
+            )
 
+            # Raw SQL bypasses the session's statement hooks
+            note_written(session, "complaints")
             await session.commit()
 
         except IntegrityError as e:
@@ -199,106 +313,53 @@ class ComplaintsService:
 
         return {
             "message": "Complaints Uploaded",
-            "resolution": f"Inserted : {inserted}, Updated : {updated}",
+            "resolution": (
+                f"Inserted : {inserted}, Changed : {changed}, "
+                f"Unchanged : {unchanged}, Closed : {closed}"
+            ),
             "type": "success",
         }
 
-    async def upload_new_complaints(self, session: AsyncSession, file: UploadFile):
-        content = await file.read()
-        try:
-            text = content.decode("utf-8-sig")
-        except Exception:
-            text = content.decode("utf-8", errors="ignore")
-
-        reader = csv.DictReader(io.StringIO(text))
-
-        if not reader.fieldnames:
+    async def upload_new_complaints(
+        self, session: AsyncSession, file: UploadFile, dry_run: bool = False
+    ):
+        reader = upload_reader(file)
+        if not await reader.fieldnames():
             return {
                 "message": "Invalid file",
-                "resolution": "CSV file has no headers",
+                "resolution": "CSV/XLSX file has no headers",
                 "type": "warning",
             }
 
-        records = []
-        line_no = 1
-
-        # Fields to convert to uppercase
-        uppercase_fields = [
-            "complaint_number",
-            "complaint_head",
-            "complaint_type",
-            "complaint_status",
-            "complaint_priority",
-            "customer_type",
-            "customer_name",
-            "customer_address1",
-            "customer_address2",
-            "customer_city",
-            "product_division",
-            "current_status",
-            "product_model",
-            "product_serial_number",
-        ]
-
-        for raw_row in reader:
-            line_no += 1
-
-            # Normalize CSV headers to snake_case-like keys
-            row = {}
-            for k, v in raw_row.items():
-                key = (k or "").strip().lower()
-                val = v.strip() if v else ""
-                # Convert to uppercase if field is in uppercase_fields and value is not None
-                if key in uppercase_fields and val != "":
-                    row[key] = val.upper()
-                else:
-                    row[key] = val if val != "" else None
-
-            # Override / ensure defaults required by the user
-            row["spare_pending"] = "N"
-            row["created_by"] = "D Manna"
-            row["final_status"] = "N"
-
-            try:
-                validated = NewComplaintsSchema(**row)
-            except ValidationError as ve:
-                return {
-                    "message": f"Validation failed for {row.get('complaint_number')}",
-                    "resolution": str(ve),
-                    "type": "warning",
-                }
-
-            records.append(validated)
-
-        if not records:
-            return {
-                "message": "Uploaded Successfully",
-                "resolution": "No valid rows found",
-            }
-
-        to_insert = []
-        present_fields = set()
-        for r in records:
-            present_fields.update(r.dict(exclude_unset=True).keys())
-        present_fields.discard("complaint_number")
-
-        for r in records:
-            data_dict = {
-                k: v
-                for k, v in r.dict(exclude_unset=False).items()
-                if k == "complaint_number" or k in present_fields
-            }
-            to_insert.append(data_dict)
-
         inserted = 0
+        report = ErrorReport()
 
         table = Complaint.__table__
 
         try:
-            if to_insert:
-                await session.execute(insert(table).values(to_insert))
-                inserted = len(to_insert)
+            async for records, errors in validate_batches(
+                reader, parse_new_complaint_row
+            ):
+                report.add(records, errors)
+                if dry_run or report or not records:
+                    continue
+                inserted += await bulk_insert(
+                    session, table, [values for _, values in records]
+                )
 
+            if dry_run:
+                return report.response()
+            if report:
+                await session.rollback()
+                return report.response()
+
+            if not inserted:
+                return {
+                    "message": "Uploaded Successfully",
+                    "resolution": "No valid rows found",
+                }
+
+            report_progress(phase="writing")
             await session.commit()
 
         except IntegrityError as e:
@@ -335,7 +396,9 @@ class ComplaintsService:
 
         # Fetch all action_head from ActionTable
         action_head_result = await session.execute(
-            select(Complaint.action_head).distinct().where(Complaint.final_status == "N")
+            select(Complaint.action_head)
+            .distinct()
+            .where(Complaint.final_status == "N")
             .order_by(Complaint.action_head)
         )
         action_heads = action_head_result.scalars().all()
@@ -391,21 +454,37 @@ class ComplaintsService:
         if action_by:
             statement = statement.where(model.action_by == action_by)
         if complaint_number:
+            # A whole stored number matches exactly (primary key); anything
+            # else by substring. Decided in the same statement: the NOT EXISTS
+            # is uncorrelated, so PostgreSQL evaluates it once per query
+            number = complaint_number.strip().upper()
+            stored = aliased(Complaint)
             statement = statement.where(
-                model.complaint_number.ilike(f"%{complaint_number}%")
+                (model.complaint_number == number)
+                | (
+                    contains(model.complaint_number, complaint_number)
+                    & ~exists().where(stored.complaint_number == number)
+                )
             )
         if customer_contact:
-            statement = statement.where(
-                (model.customer_contact1.ilike(f"%{customer_contact}%"))
-                | (model.customer_contact2.ilike(f"%{customer_contact}%"))
-            )
+            contact = customer_contact.strip()
+            if PHONE_NUMBER.fullmatch(contact):
+                statement = statement.where(
+                    (model.customer_contact1 == contact)
+                    | (model.customer_contact2 == contact)
+                )
+            else:
+                statement = statement.where(
+                    contains(model.customer_contact1, customer_contact)
+                    | contains(model.customer_contact2, customer_contact)
+                )
         if customer_name:
-            statement = statement.where(model.customer_name.ilike(f"%{customer_name}%"))
+            statement = statement.where(contains(model.customer_name, customer_name))
         if complaint_status:
             statement = statement.where(model.complaint_status == complaint_status)
         if product_serial_number:
             statement = statement.where(
-                model.product_serial_number.ilike(f"%{product_serial_number}%")
+                contains(model.product_serial_number, product_serial_number)
             )
         if complaint_head and complaint_head != "ALL":
             statement = statement.where(model.complaint_head == complaint_head)
@@ -465,7 +544,18 @@ class ComplaintsService:
         mail_to_be_sent_complaints: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        return_total: Optional[str] = None,
     ):
+        """
+        Filtered complaints ordered by date and number. Pages by `offset`, or,
+        when `cursor` is given ("" for the first page), by seeking past the
+        key it holds on ix_complaints_date_number, so every page costs the
+        same. With a cursor or `return_total` ("exact", "cached" or
+        "estimated", see _count_complaints) the result is a dict of the
+        records plus next_cursor (None on the last page) and/or
+        total_records; otherwise just the records.
+        """
         statement = select(Complaint)
         statement = self._apply_complaint_filters(
             statement,
@@ -489,37 +579,109 @@ class ComplaintsService:
             mail_to_be_sent_complaints,
         )
 
+        total_records = None
+        if return_total:
+            total_records = await self._count_complaints(
+                session, statement, return_total
+            )
+
         statement = statement.order_by(
             Complaint.complaint_date, Complaint.complaint_number
         )
-        statement = statement.limit(limit).offset(offset)
+        if cursor is None:
+            statement = statement.limit(limit).offset(offset)
+        else:
+            if cursor:
+                last_date, last_number = decode_cursor(cursor, 2)
+                if not isinstance(last_number, str):
+                    raise InvalidCursor()
+                try:
+                    last_date = date.fromisoformat(last_date)
+                except (TypeError, ValueError):
+                    raise InvalidCursor()
+                statement = statement.where(
+                    tuple_(Complaint.complaint_date, Complaint.complaint_number)
+                    > tuple_(last_date, last_number)
+                )
+            # One row past the page tells whether there is a next one
+            statement = statement.limit(limit + 1)
         result = await session.execute(statement)
         rows = result.scalars().all()
+        next_cursor = None
+        if cursor is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                rows[-1].complaint_date, rows[-1].complaint_number
+            )
+        # Plain dicts shaped like ComplaintEnquiryResponseSchema; the values come
+        # straight from typed columns so per-row validation buys nothing
         records = [
-            ComplaintEnquiryResponseSchema(
-                complaint_number=row.complaint_number,
-                complaint_date=format_date_ddmmyyyy(row.complaint_date),
-                complaint_time=row.complaint_time,
-                complaint_status=row.complaint_status,
-                customer_name=row.customer_name,
-                customer_address=row.customer_address1
+            {
+                "complaint_number": row.complaint_number,
+                "complaint_date": format_date_ddmmyyyy(row.complaint_date),
+                "complaint_time": row.complaint_time,
+                "complaint_status": row.complaint_status,
+                "customer_name": row.customer_name,
+                "customer_address": row.customer_address1
                 + (", " + row.customer_address2 if row.customer_address2 else "")
                 + ", "
                 + row.customer_city
                 + " - "
                 + row.customer_pincode,
-                customer_contact1=row.customer_contact1,
-                customer_contact2=row.customer_contact2,
-                product_division=row.product_division,
-                current_status=row.current_status,
-                action_by=row.action_by,
-                product_model=row.product_model,
-                product_serial_number=row.product_serial_number,
-                action_head=row.action_head,
-            )
+                "customer_contact1": row.customer_contact1,
+                "customer_contact2": row.customer_contact2,
+                "product_division": row.product_division,
+                "current_status": row.current_status,
+                "action_by": row.action_by,
+                "product_model": row.product_model,
+                "product_serial_number": row.product_serial_number,
+                "action_head": row.action_head,
+            }
             for row in rows
         ]
-        return records
+        if cursor is None and not return_total:
+            return records
+        page = {"records": records}
+        if cursor is not None:
+            page["next_cursor"] = next_cursor
+        if return_total:
+            page["total_records"] = total_records
+        return page
+
+    async def _count_complaints(
+        self, session: AsyncSession, statement, mode: str
+    ) -> int:
+        """
+        How many complaints `statement` (a filtered select of Complaint)
+        matches. "exact" runs COUNT(*); "cached" reuses an exact count of the
+        same filters for up to ENQUIRY_COUNT_CACHE_TTL_SECONDS; "estimated"
+        takes the planner's row estimate, which costs no scan but can be
+        well off for combined or substring filters.
+        """
+        if mode == "estimated":
+            return await estimated_count(session, statement)
+
+        count_query = statement.with_only_columns(
+            func.count(), maintain_column_froms=True
+        )
+        key = None
+        if mode == "cached":
+            # The compiled filters normalize the signature: empty, "ALL" and
+            # non-"Y" filters add nothing, and the order is the builder's
+            compiled = count_query.compile()
+            key = (
+                str(compiled),
+                tuple(sorted(compiled.params.items())),
+                table_versions("complaints"),
+            )
+            total = enquiry_count_cache.get(key)
+            if total is not None:
+                return total
+
+        total = await session.scalar(count_query) or 0
+        if key is not None:
+            enquiry_count_cache.set(key, total)
+        return total
 
     async def get_employees(self, session: AsyncSession) -> List[str]:
         result = await session.execute(
@@ -1128,18 +1290,18 @@ class ComplaintsService:
 
         update_param_stmt = (
             update(Parameter)
-            .where(Parameter.id == 1)  
+            .where(Parameter.id == 1)
             .values(rfr_number=data.rfr_number)
         )
         await session.execute(update_param_stmt)
         await session.commit()
-        
+
         recipients_list = []
         cc_list = []
-        if (data.product_division == "FANS"):
+        if data.product_division == "FANS":
             recipients_list = ["dibyendu.chatterjee@crompton.co.in"]
             cc_list = ["manna.dip2011@gmail.com", "sandipan.gayen@crompton.co.in"]
-        elif (data.product_division == "PUMP"):
+        elif data.product_division == "PUMP":
             recipients_list = ["sandipan.gayen@crompton.co.in"]
             cc_list = ["manna.dip2011@gmail.com"]
         else:
@@ -1265,7 +1427,6 @@ class ComplaintsService:
         """
         attachments = images if images else None
 
-
         message = create_email_message(
             subject=f"RFR Number - {rfr_number} for replacement of {product_division}",
             recipients=recipients,
@@ -1897,4 +2058,4 @@ class ComplaintsService:
             await mail.send_message(message)
         except Exception:
             raise EmailSendingFailed()
-        return
\ No newline at end of file
+        return
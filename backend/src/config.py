@@ -1,8 +1,11 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DATABASE_URL_CONNECT: str
+    DATABASE_URL_READ: Optional[str] = None
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     FRONTEND_URL: str
@@ -17,6 +20,100 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
 
+    # Attributes of every cookie the API sets; production serves the frontend
+    # cross-site over HTTPS, so it sets COOKIE_SAMESITE=none, COOKIE_SECURE=true
+    COOKIE_SAMESITE: str = "lax"
+    COOKIE_SECURE: bool = False
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Reads go to the primary for this long after a user's own write
+    READ_AFTER_WRITE_SECONDS: int = 10
+
+    # Slow query log; a threshold of 0 disables it
+    SLOW_QUERY_THRESHOLD_MS: int = 500
+    SLOW_QUERY_LOG_FILE: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = 5
+    # Fraction of slow SELECTs that also get EXPLAIN (ANALYZE, BUFFERS) logged
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+
+    # Render JSON responses with orjson (falls back to json if not installed)
+    FAST_JSON_RESPONSES: bool = True
+
+    # Startup warm-up; readiness waits at most WARMUP_BUDGET_SECONDS for it
+    WARMUP_ENABLED: bool = True
+    WARMUP_BUDGET_SECONDS: float = 10.0
+    WARMUP_CONNECTIONS: int = 5
+
+    # Response compression (gzip, or brotli when installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Reference-data ETags also change this often: versions are per worker, so
+    # this bounds how long another worker may answer 304 after a write
+    REFERENCE_ETAG_EPOCH_SECONDS: int = 60
+
+    # Users resolved by get_current_user; writes in AuthService evict entries
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+
+    # Birthdays and holidays shown at login are rebuilt at least this often;
+    # writes only invalidate them in the worker that made them
+    LOGIN_CONTEXT_CACHE_TTL_SECONDS: float = 300.0
+
+    # Verified JWTs, so repeat requests skip signature verification
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    # bcrypt cost factor; hashes with any other cost are re-hashed on login
+    BCRYPT_ROUNDS: int = 12
+    # Threads for bcrypt, and how many more calls may wait before a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 50
+
+    # Login/reset_password throttling of failed attempts, per username and
+    # client, and per client (rate only, no lockout). Disable for benchmarks.
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_PER_MINUTE: float = 10.0
+    LOGIN_BURST: int = 5
+    LOGIN_IP_RATE_PER_MINUTE: float = 60.0
+    LOGIN_IP_BURST: int = 30
+    # First lockout when a username's bucket runs dry; doubles on repeat
+    LOGIN_LOCKOUT_SECONDS: float = 30.0
+    LOGIN_MAX_LOCKOUT_SECONDS: float = 900.0
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 10000
+    # Comma separated addresses of reverse proxies whose X-Forwarded-For is
+    # believed; the client IP is otherwise the socket peer
+    TRUSTED_PROXIES: str = ""
+
+    # Rows parsed, validated and written per batch by the CSV uploads
+    UPLOAD_BATCH_SIZE: int = 1000
+    # Processes validating upload batches (0: one per CPU) and the most
+    # errors listed in an upload's report; the rest are only counted
+    UPLOAD_VALIDATION_WORKERS: int = 0
+    UPLOAD_MAX_REPORTED_ERRORS: int = 1000
+    # Uploads run as background jobs: how many of each upload type run at
+    # once, and how long finished jobs stay visible at /jobs/{id}
+    UPLOAD_JOB_CONCURRENCY: int = 1
+    UPLOAD_JOB_RETENTION_SECONDS: int = 3600
+    # How often a running job's progress is saved for the other workers, and
+    # how long without a save before it is reported as interrupted
+    UPLOAD_JOB_SAVE_SECONDS: float = 1.0
+    UPLOAD_JOB_STALE_SECONDS: int = 30
+
+    # Complaint enquiry totals with return_total=cached: how long a count is
+    # reused for the same filters (complaint writes in this process drop it
+    # sooner), and how many filter sets are kept
+    ENQUIRY_COUNT_CACHE_TTL_SECONDS: float = 60.0
+    ENQUIRY_COUNT_CACHE_MAX_SIZE: int = 512
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
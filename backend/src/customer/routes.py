@@ -1,6 +1,6 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -16,6 +16,8 @@ from customer.schemas import (
 from customer.service import CustomerService
 from db.db import get_session
 from exceptions import CustomerNotFound
+from utils.etag import etag_headers, not_modified, reference_etag
+from utils.responses import FastJSONResponse
 
 customer_router = APIRouter()
 customer_service = CustomerService()
@@ -56,10 +58,16 @@ List all customer names.
 
 @customer_router.get("/list_names", response_model=List, status_code=status.HTTP_200_OK)
 async def list_customer_names(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("customer")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     names = await customer_service.list_customer_names(session)
-    return names
+    return FastJSONResponse(content=names, headers=etag_headers(etag))
 
 
 """
@@ -1,23 +1,137 @@
+import time
 from typing import AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy.orm import sessionmaker
-from sqlmodel import create_engine
+from fastapi import Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import Config
 
-async_engine = AsyncEngine(
-    create_engine(
-        url=Config.DATABASE_URL_CONNECT,
+
+class PoolWaitStats:
+    """Running totals of the time spent obtaining a connection from the pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "avg_wait_seconds": (
+                round(self.total_wait / self.checkouts, 6) if self.checkouts else 0.0
+            ),
+            "max_wait_seconds": round(self.max_wait, 6),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - start, timed_out)
+
+
+def create_engine_from_url(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
         echo=False,
+        poolclass=InstrumentedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+async_engine = create_engine_from_url(Config.DATABASE_URL_CONNECT)
+
+async_session_maker = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+# Read-only routes use the replica when one is configured, else the primary
+read_replica_enabled = bool(Config.DATABASE_URL_READ)
+async_read_engine = (
+    create_engine_from_url(Config.DATABASE_URL_READ)
+    if read_replica_enabled
+    else async_engine
+)
+async_read_session_maker = (
+    async_sessionmaker(
+        bind=async_read_engine, class_=AsyncSession, expire_on_commit=False
     )
+    if read_replica_enabled
+    else async_session_maker
 )
 
+# Set on successful writes; holds the epoch second until which reads stay on primary
+READ_AFTER_WRITE_COOKIE = "read_primary_until"
+
+
+def get_pool_status(engine: AsyncEngine = async_engine) -> dict:
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow from -pool_size, so clamp idle capacity to 0
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.as_dict())
+    return status
+
 
 async def get_session() -> AsyncIterator[AsyncSession]:
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with Session() as session:
+    async with async_session_maker() as session:
+        yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    until = request.cookies.get(READ_AFTER_WRITE_COOKIE, "")
+    return until.isdigit() and int(until) > time.time()
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only routes. Uses the replica unless the caller wrote
+    something within the last READ_AFTER_WRITE_SECONDS, so users always see
+    their own changes.
+    """
+    session_maker = async_read_session_maker
+    if read_replica_enabled and wrote_recently(request):
+        session_maker = async_session_maker
+    async with session_maker() as session:
         yield session
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -7,6 +7,7 @@ from db.db import get_session
 from employee.schema import EmployeeCreate, EmployeeLeave, EmployeeResponse
 from employee.service import EmployeeService
 from exceptions import EmployeeAlreadyExists
+from utils.etag import etag_headers, not_modified, reference_etag
 
 employee_router = APIRouter()
 employee_service = EmployeeService()
@@ -48,10 +49,17 @@ List all employees.
     dependencies=[role_checker],
 )
 async def list_employees(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("employees")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     employees = await employee_service.list_employees(session)
+    response.headers.update(etag_headers(etag))
     return employees
 
 
@@ -66,10 +74,17 @@ List all standard employees.
     response_model=list[EmployeeResponse],
 )
 async def list_standard_employees(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("employees")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     employees = await employee_service.list_standard_employees(session)
+    response.headers.update(etag_headers(etag))
     return employees
 
 
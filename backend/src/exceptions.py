@@ -1,3 +1,4 @@
+import math
 from typing import Any, Callable
 
 from fastapi import FastAPI, status
@@ -98,6 +99,26 @@ class ComplaintClosed(BaseException):
     """Complaint is already closed"""
 
 
+class AuthServiceBusy(BaseException):
+    """Too many password hashes queued"""
+
+
+class JobNotFound(BaseException):
+    """Upload job not found"""
+
+
+class InvalidCursor(BaseException):
+    """Pagination cursor is malformed"""
+
+
+class TooManyLoginAttempts(BaseException):
+    """Login attempts exceeded the rate limit"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -361,6 +382,54 @@ def register_exceptions(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        AuthServiceBusy,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Too many logins in progress",
+                "resolution": "Please try again in a few seconds",
+                "error_code": "auth_service_busy",
+            },
+        ),
+    )
+
+    app.add_exception_handler(
+        JobNotFound,
+        create_exception_handler(
+            status_code=status.HTTP_404_NOT_FOUND,
+            initial_detail={
+                "message": "Upload job not found",
+                "resolution": "Finished jobs are kept for a limited time",
+                "error_code": "job_not_found",
+            },
+        ),
+    )
+
+    app.add_exception_handler(
+        InvalidCursor,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Invalid pagination cursor",
+                "resolution": "Use the next_cursor of a previous page, or omit it",
+                "error_code": "invalid_cursor",
+            },
+        ),
+    )
+
+    @app.exception_handler(TooManyLoginAttempts)
+    async def too_many_login_attempts_handler(request, exc):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "message": "Too many login attempts",
+                "resolution": "Please wait before trying again",
+                "error_code": "too_many_login_attempts",
+            },
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request, exc):
         # Customize the error message here
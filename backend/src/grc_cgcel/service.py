@@ -1,17 +1,14 @@
 import copy
-import csv
 import io
-import os
 from datetime import date
 from typing import List, Optional
 
 from fastapi import UploadFile
-from pydantic import ValidationError
 from PyPDF2 import PdfReader, PdfWriter
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
-from sqlalchemy import case, distinct, insert, select, tuple_, update
+from sqlalchemy import case, distinct, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
@@ -20,7 +17,6 @@ from exceptions import SpareNotFound, UpdateFailed
 from grc_cgcel.models import GRCCGCEL, GRCCGCELDispute, GRCCGCELReturnHistory
 from grc_cgcel.schemas import (
     GRCCGCELDisputeCreate,
-    GRCCGCELEnquiry,
     GRCCGCELHistorySchema,
     GRCCGCELReceiveSchema,
     GRCCGCELReturnFinalizePayload,
@@ -30,71 +26,61 @@ from grc_cgcel.schemas import (
     GRCCGCELUpdateReceiveSchema,
     GRCFullPayload,
 )
+from jobs.service import report_progress
+from utils.bulk import bulk_insert, bulk_update, existing_keys
+from utils.csv_stream import upload_reader
 from utils.date_utils import format_date_ddmmyyyy
-from utils.file_utils import safe_join
+from utils.file_utils import load_static_file
+from utils.validation import ErrorReport, RowError, validate_batches
 
+UPLOAD_INT_FIELDS = {"grc_number", "grc_pending_qty", "issue_qty"}
 
-class GRCCGCELService:
-    async def upload_grc_cgcel(self, session: AsyncSession, file: UploadFile):
-        content = await file.read()
-        try:
-            text = content.decode("utf-8-sig")
-        except Exception:
-            text = content.decode("utf-8", errors="ignore")
 
-        reader = csv.DictReader(io.StringIO(text))
+def parse_grc_cgcel_row(raw_row: dict) -> dict:
+    row = {}
+    for k, v in raw_row.items():
+        key = (k or "").strip().lower()
+        val = v.strip() if v else ""
+        if key in UPLOAD_INT_FIELDS:
+            try:
+                row[key] = int(val) if val != "" else None
+            except ValueError:
+                raise RowError(key, f"Not a whole number: {val!r}")
+        else:
+            row[key] = val.upper() if val != "" else None
+
+    validated = GRCCGCELSchema(
+        spare_code=row.get("spare_code"),
+        division=row.get("division"),
+        spare_description=row.get("spare_description"),
+        grc_number=row.get("grc_number"),
+        grc_date=row.get("grc_date"),
+        issue_qty=row.get("issue_qty"),
+        grc_pending_qty=row.get("grc_pending_qty"),
+    )
+    return validated.dict(exclude_unset=True)
+
 
-        if not reader.fieldnames:
+class GRCCGCELService:
+    async def upload_grc_cgcel(
+        self, session: AsyncSession, file: UploadFile, dry_run: bool = False
+    ):
+        reader = upload_reader(file)
+        if not await reader.fieldnames():
             return {
                 "message": "Invalid file",
-                "resolution": "CSV file has no headers",
+                "resolution": "CSV/XLSX file has no headers",
                 "type": "warning",
             }
 
+        report = ErrorReport()
         records = []
-        line_no = 1
-
-        for raw_row in reader:
-            line_no += 1
-
-            # Define which fields are numeric
-            int_fields = {"grc_number", "grc_pending_qty", "issue_qty"}
-            row = {}
-            for k, v in raw_row.items():
-                key = (k or "").strip().lower()
-                val = v.strip() if v else ""
-                if key in int_fields:
-                    row[key] = int(val) if val != "" else None
-                else:
-                    row[key] = val.upper() if val != "" else None
+        async for batch, errors in validate_batches(reader, parse_grc_cgcel_row):
+            report.add(batch, errors)
+            records.extend(values for _, values in batch)
 
-            spare_code = row.get("spare_code")
-            division = row.get("division")
-            spare_description = row.get("spare_description")
-            grc_number = row.get("grc_number")
-            grc_date = row.get("grc_date")
-            issue_qty = row.get("issue_qty")
-            grc_pending_qty = row.get("grc_pending_qty")
-
-            try:
-                validated = GRCCGCELSchema(
-                    spare_code=spare_code,
-                    division=division,
-                    spare_description=spare_description,
-                    grc_number=grc_number,
-                    grc_date=grc_date,
-                    issue_qty=issue_qty,
-                    grc_pending_qty=grc_pending_qty,
-                    status="N",
-                )
-            except ValidationError as ve:
-                return {
-                    "message": f"Validation failed for {spare_code}",
-                    "resolution": str(ve),
-                    "type": "warning",
-                }
-
-            records.append(validated)
+        if dry_run or report:
+            return report.response()
 
         if not records:
             return {
@@ -102,17 +88,13 @@ class GRCCGCELService:
                 "resolution": "No valid rows found",
             }
 
+        report_progress(phase="writing")
         # Use (spare_code, grc_number) as composite key
-        from sqlalchemy import tuple_
-
-        keys = [(r.spare_code, r.grc_number) for r in records]
+        keys = [(r["spare_code"], r["grc_number"]) for r in records]
 
-        result = await session.execute(
-            select(GRCCGCEL).where(
-                tuple_(GRCCGCEL.spare_code, GRCCGCEL.grc_number).in_(keys)
-            )
+        existing = await existing_keys(
+            session, [GRCCGCEL.spare_code, GRCCGCEL.grc_number], keys
         )
-        existing = {(r.spare_code, r.grc_number): r for r in result.scalars().all()}
 
         to_insert = []
         to_update = {}
@@ -120,7 +102,7 @@ class GRCCGCELService:
         # Determine which columns are present in the CSV (excluding spare_code and grc_number)
         present_fields = set()
         for r in records:
-            present_fields.update(r.dict(exclude_unset=True).keys())
+            present_fields.update(r.keys())
         present_fields.discard("spare_code")
         present_fields.discard("grc_number")
 
@@ -128,12 +110,12 @@ class GRCCGCELService:
             # Only include fields present in the CSV (plus spare_code, grc_number), and set status='N'
             data_dict = {
                 k: v
-                for k, v in r.dict(exclude_unset=False).items()
+                for k, v in r.items()
                 if k in ("spare_code", "grc_number") or k in present_fields
             }
             data_dict["status"] = "N"
             data_dict.setdefault("actual_pending_qty", data_dict.get("grc_pending_qty"))
-            key = (r.spare_code, r.grc_number)
+            key = (r["spare_code"], r["grc_number"])
             if key in existing:
                 to_update[key] = data_dict
             else:
@@ -147,31 +129,20 @@ class GRCCGCELService:
         try:
             await session.execute(update(table).values(status="Y"))
 
-            if to_insert:
-                await session.execute(insert(table).values(to_insert))
-                inserted = len(to_insert)
-
-            if to_update:
-                # Only update fields present in the CSV (excluding spare_code, grc_number)
-                update_fields = present_fields.copy()
-                update_fields.add("status")
-                for key, values in to_update.items():
-                    stmt = (
-                        update(table)
-                        .where(
-                            (table.c.spare_code == key[0])
-                            & (table.c.grc_number == key[1])
-                        )
-                        .values(
-                            **{
-                                field: values[field]
-                                for field in update_fields
-                                if field in values
-                            }
-                        )
-                    )
-                    await session.execute(stmt)
-                updated = len(to_update)
+            inserted = await bulk_insert(session, table, to_insert)
+
+            # Only update fields present in the CSV (and status); spare_code and
+            # grc_number pick the row
+            update_fields = present_fields | {"status", "spare_code", "grc_number"}
+            updated = await bulk_update(
+                session,
+                table,
+                ["spare_code", "grc_number"],
+                [
+                    {k: v for k, v in values.items() if k in update_fields}
+                    for values in to_update.values()
+                ],
+            )
 
             await session.commit()
 
@@ -549,22 +520,14 @@ class GRCCGCELService:
 
         overlay = generate_overlay(data_dict)
 
-        # Path to the static PDF template (use absolute path for portability, with path injection protection)
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        static_dir = os.path.normpath(os.path.join(base_dir, "..", "static"))
+        # Static PDF template, read from disk once and then served from memory
         if report_type == "Defective":
-            template_path = safe_join(static_dir, "grc_cgcel_defective.pdf")
+            template_name = "grc_cgcel_defective.pdf"
         elif report_type == "Good":
-            template_path = safe_join(static_dir, "grc_cgcel_good.pdf")
+            template_name = "grc_cgcel_good.pdf"
         else:
-            template_path = safe_join(static_dir, "grc_cgcel_all.pdf")
-
-        # Read the template PDF
-        try:
-            with open(template_path, "rb") as f:
-                template_bytes = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Template PDF not found at {template_path}")
+            template_name = "grc_cgcel_all.pdf"
+        template_bytes = load_static_file(template_name)
         template_buffer = io.BytesIO(template_bytes)
         template_pdf = PdfReader(template_buffer)
 
@@ -713,7 +676,7 @@ class GRCCGCELService:
         rows = result.scalars().all()
         records = []
         for row in rows:
-            # Build dict for only fields present in schema
+            # Plain dict shaped like GRCCGCELEnquiry
             record = {}
             record["spare_code"] = getattr(row, "spare_code", None)
             record["spare_description"] = getattr(row, "spare_description", None)
@@ -734,7 +697,7 @@ class GRCCGCELService:
                     getattr(row, "challan_date", None)
                 )
                 record["docket_number"] = getattr(row, "docket_number", None)
-            records.append(GRCCGCELEnquiry(**record))
+            records.append(record)
         if return_total:
             return records, total_records
         return records
@@ -7,7 +7,7 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
-from db.db import get_session
+from db.db import get_read_session, get_session
 from grc_cgpisl.schemas import (
     GRCCGPISLEnquiry,
     GRCCGPISLReceiveSchema,
@@ -18,6 +18,8 @@ from grc_cgpisl.schemas import (
     GRCFullPayload,
 )
 from grc_cgpisl.service import GRCCGPISLService
+from jobs.service import submit_upload
+from utils.responses import FastJSONResponse
 
 grc_cgpisl_router = APIRouter()
 grc_cgpisl_service = GRCCGPISLService()
@@ -26,43 +28,27 @@ role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
 
 
 """
-Upload GRC CGPISL data via CSV file.
+Upload GRC CGPISL data via CSV or XLSX file.
+Runs as a background job; poll /jobs/{id} with the returned id for progress
+and the result. With dry_run, only validate and report every error found;
+nothing is written.
 """
 
 
 @grc_cgpisl_router.post(
     "/upload",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[role_checker],
 )
 async def upload_grc_cgpisl(
-    session: AsyncSession = Depends(get_session),
     file: UploadFile = File(...),
+    dry_run: bool = False,
     _=Depends(access_token_bearer),
 ):
-    try:
-        result = await grc_cgpisl_service.upload_grc_cgpisl(session, file)
-    except Exception as exc:
-        return JSONResponse(
-            content={
-                "message": "Processing failed",
-                "resolution": str(exc),
-                "type": "error",
-            },
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    if result.get("type") in ("warning", "error"):
-        return JSONResponse(
-            content=result,
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
-
-    # Success
-    return JSONResponse(
-        content=result,
-        status_code=status.HTTP_200_OK,
+    job = await submit_upload(
+        "grc_cgpisl", file, grc_cgpisl_service.upload_grc_cgpisl, dry_run
     )
+    return FastJSONResponse(content=job.as_dict(), status_code=status.HTTP_202_ACCEPTED)
 
 
 """
@@ -76,7 +62,7 @@ GRC Numbers not received yet.
     status_code=status.HTTP_200_OK,
 )
 async def not_received_grc(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     result = await grc_cgpisl_service.not_received_grc_numbers(session)
@@ -235,7 +221,7 @@ async def enquiry_grc_cgpisl(
     grc_status: Optional[str] = "N",
     limit: int = 100,
     offset: int = 0,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     try:
@@ -252,6 +238,8 @@ async def enquiry_grc_cgpisl(
             offset,
             return_total=True,
         )
-        return {"records": result, "total_records": total_records}
+        return FastJSONResponse(
+            content={"records": result, "total_records": total_records}
+        )
     except Exception as exc:
         return {"records": [], "total_records": 0}
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlmodel import Column, Field, SQLModel
+
+
+class UploadJob(SQLModel, table=True):
+    """
+    A background upload's state, shared by every worker: the one running it
+    saves it every UPLOAD_JOB_SAVE_SECONDS, any of them answers the polls.
+    """
+
+    __tablename__ = "upload_jobs"
+
+    id: str = Field(sa_column=Column(pg.VARCHAR(32), primary_key=True, nullable=False))
+    kind: str = Field(sa_column=Column(pg.VARCHAR(20), nullable=False))
+    filename: Optional[str] = Field(sa_column=Column(pg.VARCHAR(255), nullable=True))
+    phase: str = Field(sa_column=Column(pg.VARCHAR(12), nullable=False))
+    rows: int = Field(sa_column=Column(pg.INTEGER, nullable=False))
+    rows_written: int = Field(sa_column=Column(pg.INTEGER, nullable=False))
+    write_seconds: float = Field(sa_column=Column(pg.FLOAT, nullable=False))
+    result: Optional[dict] = Field(sa_column=Column(pg.JSONB, nullable=True))
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False)
+    )
+    started_at: Optional[datetime] = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True)
+    )
+    finished_at: Optional[datetime] = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True, index=True)
+    )
+    # Last save by the running worker; a stale unfinished job was interrupted
+    updated_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False)
+    )
+
+    def __repr__(self):
+        return f"<UploadJob {self.id}>"
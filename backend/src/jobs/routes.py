@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.dependencies import AccessTokenBearer, RoleChecker
+from db.db import get_session
+from exceptions import JobNotFound
+from jobs.service import get_job as find_job
+from utils.responses import FastJSONResponse
+
+jobs_router = APIRouter()
+access_token_bearer = AccessTokenBearer()
+role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
+
+
+"""
+Progress of a background upload: phase (queued, validating, writing, done or
+failed), rows processed, throughput (overall and of the writes), and the
+upload's result once finished.
+"""
+
+
+@jobs_router.get(
+    "/{job_id}",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def get_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
+):
+    job = await find_job(session, job_id)
+    if job is None:
+        raise JobNotFound()
+    return FastJSONResponse(content=job.as_dict())
@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from starlette.concurrency import run_in_threadpool
+
+from config import Config
+from db.db import async_session_maker
+from jobs.models import UploadJob
+
+logger = logging.getLogger("uvicorn.error")
+
+# The upload services: (session, file, dry_run) -> result dict
+UploadHandler = Callable[[AsyncSession, UploadFile, bool], Awaitable[dict]]
+
+# Same in-memory threshold as Starlette's spooled uploads
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class Job:
+    """A background upload: its progress, then the service's result dict."""
+
+    def __init__(self, kind: str, filename: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.filename = filename
+        self.phase = "queued"
+        self.rows = 0
+        self.rows_written = 0
+        self.write_seconds = 0.0
+        self.result: Optional[dict] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_row(cls, row: UploadJob) -> "Job":
+        """A job saved by any worker; one its worker stopped saving failed."""
+        job = cls(row.kind, row.filename)
+        job.id = row.id
+        job.phase = row.phase
+        job.rows = row.rows
+        job.rows_written = row.rows_written
+        job.write_seconds = row.write_seconds
+        job.result = row.result
+        job.created_at = row.created_at.timestamp()
+        job.started_at = row.started_at and row.started_at.timestamp()
+        job.finished_at = row.finished_at and row.finished_at.timestamp()
+        stale = time.time() - row.updated_at.timestamp()
+        if job.finished_at is None and stale > Config.UPLOAD_JOB_STALE_SECONDS:
+            job.phase = "failed"
+            job.finished_at = row.updated_at.timestamp()
+            job.result = {
+                "message": "Upload interrupted",
+                "resolution": "The server stopped before it finished; upload again",
+                "type": "error",
+            }
+        return job
+
+    def as_row(self) -> dict:
+        def stamp(seconds: Optional[float]) -> Optional[datetime]:
+            if seconds is None:
+                return None
+            return datetime.fromtimestamp(seconds, timezone.utc)
+
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "phase": self.phase,
+            "rows": self.rows,
+            "rows_written": self.rows_written,
+            "write_seconds": self.write_seconds,
+            "result": self.result,
+            "created_at": stamp(self.created_at),
+            "started_at": stamp(self.started_at),
+            "finished_at": stamp(self.finished_at),
+            "updated_at": stamp(time.time()),
+        }
+
+    def as_dict(self) -> dict:
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "filename": self.filename,
+            "phase": self.phase,
+            "rows": self.rows,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "rows_written": self.rows_written,
+            "write_rows_per_second": (
+                round(self.rows_written / self.write_seconds, 1)
+                if self.write_seconds
+                else 0.0
+            ),
+            "result": self.result,
+        }
+
+
+# This process's unfinished jobs by id. Every job is also saved to upload_jobs
+# so polls can land on any worker; finished ones are kept there for
+# UPLOAD_JOB_RETENTION_SECONDS
+jobs: Dict[str, Job] = {}
+_limits: Dict[str, asyncio.Semaphore] = {}
+_current_job: ContextVar[Optional[Job]] = ContextVar("current_job", default=None)
+
+
+def report_progress(phase: Optional[str] = None, rows: int = 0):
+    """Move the job running the current task, if any, on; a no-op otherwise."""
+    job = _current_job.get()
+    if job is None:
+        return
+    if phase is not None:
+        job.phase = phase
+    job.rows += rows
+
+
+def report_write(rows: int, seconds: float):
+    """Add a written chunk to the current job's write throughput, if any."""
+    job = _current_job.get()
+    if job is None:
+        return
+    job.rows_written += rows
+    job.write_seconds += seconds
+
+
+async def _save(job: Job):
+    row = job.as_row()
+    statement = insert(UploadJob).values(**row)
+    statement = statement.on_conflict_do_update(
+        index_elements=[UploadJob.id],
+        set_={column: statement.excluded[column] for column in row if column != "id"},
+    )
+    async with async_session_maker() as session:
+        await session.execute(statement)
+        await session.commit()
+
+
+async def _keep_saving(job: Job):
+    """Save a running job every UPLOAD_JOB_SAVE_SECONDS for the other workers."""
+    while True:
+        await asyncio.sleep(Config.UPLOAD_JOB_SAVE_SECONDS)
+        try:
+            await _save(job)
+        except Exception:
+            logger.exception("Saving upload job %s failed", job.id)
+
+
+async def _prune():
+    cutoff = datetime.fromtimestamp(
+        time.time() - Config.UPLOAD_JOB_RETENTION_SECONDS, timezone.utc
+    )
+    async with async_session_maker() as session:
+        await session.execute(delete(UploadJob).where(UploadJob.finished_at < cutoff))
+        await session.commit()
+
+
+def _spool(file: UploadFile):
+    copy = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    file.file.seek(0)
+    shutil.copyfileobj(file.file, copy)
+    copy.seek(0)
+    return copy
+
+
+async def _run(job: Job, upload: UploadFile, handler: UploadHandler, dry_run: bool):
+    _current_job.set(job)
+    saver = asyncio.create_task(_keep_saving(job))
+    limit = _limits.setdefault(
+        job.kind, asyncio.Semaphore(Config.UPLOAD_JOB_CONCURRENCY)
+    )
+    try:
+        async with limit:
+            job.started_at = time.time()
+            job.phase = "validating"
+            async with async_session_maker() as session:
+                job.result = await handler(session, upload, dry_run)
+        failed = job.result.get("type") in ("warning", "error")
+        job.phase = "failed" if failed else "done"
+    except asyncio.CancelledError:
+        job.phase = "failed"
+        job.result = {
+            "message": "Upload cancelled",
+            "resolution": "The server stopped before it finished; upload again",
+            "type": "error",
+        }
+        raise
+    except Exception as exc:
+        logger.exception("Upload job %s (%s) failed", job.id, job.kind)
+        job.phase = "failed"
+        job.result = {
+            "message": "Processing failed",
+            "resolution": str(exc),
+            "type": "error",
+        }
+    finally:
+        job.finished_at = time.time()
+        await upload.close()
+        saver.cancel()
+        try:
+            await _save(job)
+        except Exception:
+            # Kept for polls that reach this worker; the others see it stall
+            logger.exception("Saving upload job %s failed", job.id)
+        else:
+            jobs.pop(job.id, None)
+
+
+async def submit_upload(
+    kind: str, file: UploadFile, handler: UploadHandler, dry_run: bool = False
+) -> Job:
+    """
+    Run `handler` on a copy of `file` in the background and return its job at
+    once. At most UPLOAD_JOB_CONCURRENCY jobs of each `kind` run together; the
+    rest wait in the "queued" phase. The job is not tied to the request, so it
+    carries on if the client goes away.
+    """
+    await _prune()
+    # FastAPI closes the request's upload once the response is sent
+    spooled = await run_in_threadpool(_spool, file)
+    job = Job(kind, file.filename)
+    upload = UploadFile(file=spooled, filename=file.filename, headers=file.headers)
+    await _save(job)
+    jobs[job.id] = job
+    job.task = asyncio.create_task(_run(job, upload, handler, dry_run))
+    return job
+
+
+async def get_job(session: AsyncSession, job_id: str) -> Optional[Job]:
+    """The job, from this process if it is running here, else as last saved."""
+    job = jobs.get(job_id)
+    if job is not None:
+        return job
+    row = (await session.exec(select(UploadJob).where(UploadJob.id == job_id))).first()
+    return Job.from_row(row) if row is not None else None
+
+
+async def stop_jobs():
+    """Cancel unfinished jobs at shutdown; they are reported as failed."""
+    running = [job.task for job in jobs.values() if job.task and not job.task.done()]
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
@@ -1,22 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
 
+from admin.routes import admin_router
 from auth.routes import auth_router
 from complaints.routes import complaints_router
 from customer.routes import customer_router
+from db.db import async_engine, async_read_engine, read_replica_enabled
 from employee.routes import employee_router
 from exceptions import register_exceptions
 from grc_cgcel.routes import grc_cgcel_router
 from grc_cgpisl.routes import grc_cgpisl_router
+from jobs.routes import jobs_router
+from jobs.service import stop_jobs
 from menu.routes import menu_router
+from metrics.routes import metrics_router
 from middleware.middleware import register_middleware
 from notification.routes import notification_router
 from stock_cgcel.routes import stock_cgcel_router
 from stock_cgpisl.routes import stock_cgpisl_router
 from parameter.routes import parameter_router
+from utils.responses import FastJSONResponse
+from utils.validation import shutdown_validation_pool
+from warmup.service import start_warmup, stop_warmup
 
 version = "v1"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_warmup()
+    yield
+    await stop_warmup()
+    await stop_jobs()
+    shutdown_validation_pool()
+    await async_engine.dispose()
+    if read_replica_enabled:
+        await async_read_engine.dispose()
+
+
 app = FastAPI(
     version=version,
     title="Complaint Management",
@@ -30,6 +53,8 @@ app = FastAPI(
     openapi_url=f"/openapi.json",
     docs_url=f"/docs",
     redoc_url=f"/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -72,3 +97,6 @@ app.include_router(grc_cgpisl_router, prefix="/grc_cgpisl", tags=["GRC CGPISL"])
 app.include_router(complaints_router, prefix="/complaints", tags=["Complaints"])
 app.include_router(customer_router, prefix="/customer", tags=["Customer"])
 app.include_router(parameter_router, prefix="/parameter", tags=["Parameter"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
+app.include_router(jobs_router, prefix="/jobs", tags=["Jobs"])
+app.include_router(metrics_router, tags=["Metrics"])
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import PlainTextResponse
+
+from auth.dependencies import AccessTokenBearer, RoleChecker
+from metrics.service import render_metrics
+
+metrics_router = APIRouter()
+access_token_bearer = AccessTokenBearer()
+role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
+
+
+"""
+Request, SQL and connection pool metrics in Prometheus text exposition format.
+Admins only: the scraper sends an admin's bearer token.
+"""
+
+
+@metrics_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[role_checker],
+)
+async def metrics(_=Depends(access_token_bearer)):
+    return PlainTextResponse(
+        content=render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,364 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import Scope
+
+from db.db import async_engine, async_read_engine, get_pool_status, read_replica_enabled
+from metrics.slow_queries import slow_query_log
+from utils.cache import CACHES, TTLCache
+from utils.rate_limit import LIMITERS
+
+# Seconds; covers fast lookups through to the large CSV uploads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._values: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._values[label_values] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted(
+                (key, (list(series[0]), series[1], series[2]))
+                for key, series in self._values.items()
+            )
+        for label_values, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labels, label_values, le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class GaugeCollector:
+    """Gauges read at scrape time from a callback returning {label values: value}."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...],
+        collect: Callable[[], Dict[LabelValues, float]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for label_values, value in sorted(self.collect().items()):
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests handled",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency",
+        ("method", "route"),
+    )
+)
+http_request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements issued while handling one request",
+        ("method", "route"),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+http_request_db_seconds = registry.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent in SQL statements while handling one request",
+        ("method", "route"),
+    )
+)
+db_queries_total = registry.register(
+    Counter("db_queries_total", "SQL statements executed", ("engine",))
+)
+db_query_seconds_total = registry.register(
+    Counter(
+        "db_query_seconds_total", "Time spent executing SQL statements", ("engine",)
+    )
+)
+http_response_uncompressed_bytes_total = registry.register(
+    Counter(
+        "http_response_uncompressed_bytes_total",
+        "Response body bytes before compression, for compressed responses",
+        ("route", "encoding"),
+    )
+)
+http_response_bytes_saved_total = registry.register(
+    Counter(
+        "http_response_bytes_saved_total",
+        "Response body bytes saved by compression",
+        ("route", "encoding"),
+    )
+)
+
+
+class RequestStats:
+    """SQL accounting for the request currently being handled."""
+
+    __slots__ = ("scope", "queries", "db_seconds")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        return f"{self.scope['method']} {route_label(self.scope)}"
+
+
+def route_label(scope: Scope) -> str:
+    # Use the route template so /customer/{code} is one series, not one per code
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    return "unmatched"
+
+
+# Set by MetricsMiddleware; shared by reference with any tasks the request spawns
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine, name: str):
+    """Count statements and time spent in them, globally and per request."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        db_queries_total.inc(name)
+        db_query_seconds_total.inc(name, amount=elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        slow_query_log.record(
+            engine,
+            statement,
+            parameters,
+            elapsed,
+            stats.route if stats is not None else None,
+            executemany,
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute is skipped for failed statements
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+instrument_engine(async_engine, "primary")
+if read_replica_enabled:
+    instrument_engine(async_read_engine, "replica")
+
+
+def _pool_engines() -> Dict[str, AsyncEngine]:
+    engines = {"primary": async_engine}
+    if read_replica_enabled:
+        engines["replica"] = async_read_engine
+    return engines
+
+
+def _pool_gauge(field: str) -> Callable[[], Dict[LabelValues, float]]:
+    def collect():
+        return {
+            (name,): get_pool_status(engine)[field]
+            for name, engine in _pool_engines().items()
+        }
+
+    return collect
+
+
+for _field, _documentation in (
+    ("checked_out", "Connections currently checked out of the pool"),
+    ("checked_in", "Idle connections held by the pool"),
+    ("overflow", "Connections opened beyond pool_size"),
+    ("timeouts", "Checkouts that timed out waiting for a connection"),
+    ("total_wait_seconds", "Total time spent waiting for a pooled connection"),
+):
+    registry.register(
+        GaugeCollector(
+            f"db_pool_{_field}", _documentation, ("engine",), _pool_gauge(_field)
+        )
+    )
+
+
+def _cache_gauge(read: Callable) -> Callable[[], Dict[LabelValues, float]]:
+    def collect():
+        return {(name,): read(cache) for name, cache in CACHES.items()}
+
+    return collect
+
+
+# Each hit is a query (or token verification) that didn't have to run
+for _suffix, _documentation, _read in (
+    ("hits", "Lookups served from the cache", lambda cache: cache.hits),
+    ("misses", "Lookups that went to the source", lambda cache: cache.misses),
+    ("hit_ratio", "Share of lookups served from the cache", TTLCache.hit_ratio),
+    ("entries", "Entries currently cached", len),
+):
+    registry.register(
+        GaugeCollector(
+            f"cache_{_suffix}", _documentation, ("cache",), _cache_gauge(_read)
+        )
+    )
+
+
+def _limiter_gauge(field: str) -> Callable[[], Dict[LabelValues, float]]:
+    def collect():
+        return {(name,): getattr(limiter, field) for name, limiter in LIMITERS.items()}
+
+    return collect
+
+
+for _field, _documentation in (
+    ("allowed", "Attempts let through by the rate limiter"),
+    ("limited", "Attempts rejected with 429"),
+    ("lockouts", "Times a key was locked out"),
+):
+    registry.register(
+        GaugeCollector(
+            f"rate_limit_{_field}", _documentation, ("limiter",), _limiter_gauge(_field)
+        )
+    )
+registry.register(
+    GaugeCollector(
+        "rate_limit_tracked_keys",
+        "Keys currently held by the rate limiter",
+        ("limiter",),
+        lambda: {(name,): len(limiter) for name, limiter in LIMITERS.items()},
+    )
+)
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,231 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import reprlib
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import Config
+
+# Shapes tracked in memory; the least slow are dropped beyond this
+MAX_TRACKED_SHAPES = 500
+# Don't EXPLAIN the same shape more often than this
+EXPLAIN_COOLDOWN_SECONDS = 300
+MAX_LOGGED_PARAMETER_CHARS = 2000
+
+# Abbreviates as it goes, so a huge executemany batch is never repr'd in full
+_parameter_repr = reprlib.Repr()
+_parameter_repr.maxlevel = 3
+_parameter_repr.maxlist = _parameter_repr.maxtuple = _parameter_repr.maxdict = 50
+_parameter_repr.maxstring = _parameter_repr.maxother = 200
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape so literals and IN lists of any size group."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("?, ...", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _build_logger() -> logging.Logger:
+    logger = logging.getLogger("slow_query")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        directory = os.path.dirname(Config.SLOW_QUERY_LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            Config.SLOW_QUERY_LOG_FILE,
+            maxBytes=Config.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=Config.SLOW_QUERY_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+class ShapeStats:
+    __slots__ = (
+        "shape",
+        "count",
+        "total_seconds",
+        "max_seconds",
+        "last_route",
+        "last_seen",
+        "last_explained",
+    )
+
+    def __init__(self, shape: str):
+        self.shape = shape
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_route = None
+        self.last_seen = None
+        self.last_explained = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "statement": self.shape,
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "last_route": self.last_route,
+            "last_seen": self.last_seen,
+        }
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than SLOW_QUERY_THRESHOLD_MS with their parameters
+    and calling route, keeps per-shape totals for the admin report, and for a
+    sample of slow SELECTs logs EXPLAIN (ANALYZE, BUFFERS) as well.
+    """
+
+    def __init__(self):
+        self.threshold = Config.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.sample_rate = Config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        self.logger = _build_logger() if self.threshold > 0 else None
+        self._shapes: Dict[str, ShapeStats] = {}
+        self._lock = threading.Lock()
+        self._explain_tasks = set()
+
+    def record(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters,
+        elapsed: float,
+        route: Optional[str],
+        executemany: bool,
+    ):
+        if self.logger is None or elapsed < self.threshold:
+            return
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        shape = normalize_statement(statement)
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= MAX_TRACKED_SHAPES:
+                    self._evict()
+                stats = ShapeStats(shape)
+                self._shapes[shape] = stats
+            stats.count += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.last_route = route
+            stats.last_seen = now
+            explain = self._should_explain(stats, statement, executemany)
+
+        self.logger.info(
+            json.dumps(
+                {
+                    "time": now,
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "route": route,
+                    "statement": statement,
+                    "parameters": _parameter_repr.repr(parameters)[
+                        :MAX_LOGGED_PARAMETER_CHARS
+                    ],
+                }
+            )
+        )
+        if explain:
+            self._schedule_explain(engine, statement, parameters, route)
+
+    def _evict(self):
+        slowest_first = sorted(
+            self._shapes.values(), key=lambda s: s.total_seconds, reverse=True
+        )
+        for stats in slowest_first[MAX_TRACKED_SHAPES // 2 :]:
+            del self._shapes[stats.shape]
+
+    def _should_explain(self, stats: ShapeStats, statement: str, executemany: bool):
+        # ANALYZE runs the statement again, so only ever for single SELECTs
+        if executemany or self.sample_rate <= 0:
+            return False
+        if statement.lstrip()[:6].upper() != "SELECT":
+            return False
+        if "FOR UPDATE" in statement.upper():
+            return False
+        if time.monotonic() - stats.last_explained < EXPLAIN_COOLDOWN_SECONDS:
+            return False
+        if random.random() >= self.sample_rate:
+            return False
+        stats.last_explained = time.monotonic()
+        return True
+
+    def _schedule_explain(self, engine: AsyncEngine, statement, parameters, route):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Fresh context so the EXPLAIN isn't counted against the calling request
+        # (create_task's context argument needs Python 3.11)
+        task = contextvars.Context().run(
+            loop.create_task, self._explain(engine, statement, parameters, route)
+        )
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, engine: AsyncEngine, statement, parameters, route):
+        # A separate connection so the request's transaction is never touched
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+                )
+                plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+        self.logger.info(
+            json.dumps(
+                {
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "route": route,
+                    "statement": statement,
+                    "explain": plan,
+                }
+            )
+        )
+
+    def top(self, limit: int, order_by: str = "total") -> List[dict]:
+        key = {
+            "total": lambda s: s.total_seconds,
+            "max": lambda s: s.max_seconds,
+            "count": lambda s: s.count,
+        }[order_by]
+        with self._lock:
+            shapes = sorted(self._shapes.values(), key=key, reverse=True)[:limit]
+            return [stats.as_dict() for stats in shapes]
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,218 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import Config
+from metrics.service import (
+    http_response_bytes_saved_total,
+    http_response_uncompressed_bytes_total,
+    route_label,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+# Route templates whose responses are never compressed. The auth responses
+# carry tokens next to user-supplied values, the classic BREACH setup.
+COMPRESSION_EXCLUDED_ROUTES = {
+    "/auth/login",
+    "/auth/refresh_token",
+    "/auth/me",
+}
+
+# Already compressed formats; compressing them again only costs CPU
+INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/")
+INCOMPRESSIBLE_TYPES = {
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/x-brotli",
+    "application/x-7z-compressed",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "text/event-stream",
+}
+COMPRESSIBLE_EXCEPTIONS = {"image/svg+xml"}
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if content_type in COMPRESSIBLE_EXCEPTIONS:
+        return True
+    return not (
+        content_type in INCOMPRESSIBLE_TYPES
+        or content_type.startswith(INCOMPRESSIBLE_PREFIXES)
+    )
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=Config.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            # wbits 16 + 15 writes a gzip header and trailer
+            self._zlib = zlib.compressobj(
+                Config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli or gzip, whichever the client prefers.
+    Bodies under COMPRESSION_MIN_BYTES, already encoded or already compressed
+    content, and COMPRESSION_EXCLUDED_ROUTES go out untouched. Streaming
+    responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not Config.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, scope: Scope, send: Send, encoding: str):
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.original_bytes = 0
+        self.sent_bytes = 0
+
+    async def send(self, message: Message):
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk shows the size
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            await self._start(message, body, more_body)
+            return
+
+        self.original_bytes += len(body)
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        self.sent_bytes += len(chunk)
+        if chunk or not more_body:
+            await self.downstream(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+        if not more_body:
+            self._record()
+
+    async def _start(self, message: Message, body: bytes, more_body: bool):
+        start = self.start_message
+        headers = MutableHeaders(raw=start["headers"])
+        eligible = (
+            start["status"] not in (204, 304)
+            and is_compressible(headers)
+            and route_label(self.scope) not in COMPRESSION_EXCLUDED_ROUTES
+            and (more_body or len(body) >= Config.COMPRESSION_MIN_BYTES)
+        )
+        if not eligible:
+            self.passthrough = True
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        self.compressor = _Compressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from what a strong ETag names
+            headers["ETag"] = "W/" + etag
+
+        self.original_bytes = len(body)
+        chunk = self.compressor.compress(body)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            chunk += self.compressor.finish()
+            headers["Content-Length"] = str(len(chunk))
+        self.sent_bytes = len(chunk)
+
+        start["headers"] = headers.raw
+        await self.downstream(start)
+        await self.downstream(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+        if not more_body:
+            self._record()
+
+    def _record(self):
+        route = route_label(self.scope)
+        http_response_uncompressed_bytes_total.inc(
+            route, self.encoding, amount=self.original_bytes
+        )
+        http_response_bytes_saved_total.inc(
+            route, self.encoding, amount=self.original_bytes - self.sent_bytes
+        )
@@ -3,15 +3,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from config import Config
-from middleware.capitalize import CapitalizeJSONMiddleware
-from middleware.strip import StripJSONMiddleware
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.normalize import NormalizeJSONMiddleware
+from middleware.read_after_write import ReadAfterWriteMiddleware
 
 
 def register_middleware(app: FastAPI):
 
-    app.add_middleware(CapitalizeJSONMiddleware)
+    app.add_middleware(NormalizeJSONMiddleware)
 
-    app.add_middleware(StripJSONMiddleware)
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+    app.add_middleware(CompressionMiddleware)
+
+    # Outermost of our own middleware so its timing covers the others
+    app.add_middleware(MetricsMiddleware)
 
     app.add_middleware(
         CORSMiddleware,
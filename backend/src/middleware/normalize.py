@@ -0,0 +1,106 @@
+import json
+from typing import Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# (strip, uppercase) per path; anything not listed is stripped and uppercased.
+# Credentials and free text (notifications, email bodies) must keep their case.
+DEFAULT_RULE = (True, True)
+NORMALIZE_RULES = {
+    "/auth/login": None,
+    "/auth/reset_password": None,
+    "/employee/create_employee": None,
+    "/employee/delete_employee": None,
+    "/notification/create_notification": (True, False),
+    "/complaints/send_email": (True, False),
+}
+
+
+def normalize_values(obj, upper: bool):
+    """Strip (and optionally uppercase) every string value in one traversal."""
+    if isinstance(obj, str):
+        obj = obj.strip()
+        return obj.upper() if upper else obj
+    elif isinstance(obj, dict):
+        return {k: normalize_values(v, upper) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [normalize_values(item, upper) for item in obj]
+    else:
+        return obj
+
+
+def normalize_body(body: bytes, upper: bool) -> Optional[bytes]:
+    try:
+        data = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return json.dumps(normalize_values(data, upper)).encode("utf-8")
+
+
+def is_json(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"application/json"
+    return False
+
+
+class NormalizeJSONMiddleware:
+    """
+    Strips and uppercases string values in JSON request bodies before they
+    reach the routes. Non-JSON requests (CSV uploads etc.) pass straight
+    through without being buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not is_json(scope):
+            await self.app(scope, receive, send)
+            return
+
+        rule: Optional[Tuple[bool, bool]] = NORMALIZE_RULES.get(
+            scope["path"], DEFAULT_RULE
+        )
+        if rule is None or not rule[0]:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client went away mid-body; let the app see the disconnect
+                await self.app(scope, _replay(message, receive), send)
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        body = b"".join(chunks)
+        if body:
+            normalized = normalize_body(body, upper=rule[1])
+            if normalized is not None:
+                body = normalized
+                # Mutate rather than copy scope so MetricsMiddleware sees scope["route"]
+                scope["headers"] = [
+                    (name, value)
+                    for name, value in scope["headers"]
+                    if name != b"content-length"
+                ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+
+        message = {"type": "http.request", "body": body, "more_body": False}
+        await self.app(scope, _replay(message, receive), send)
+
+
+def _replay(first: Message, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return first
+        return await receive()
+
+    return replay
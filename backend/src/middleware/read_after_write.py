@@ -0,0 +1,46 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import Config
+from db.db import READ_AFTER_WRITE_COOKIE, read_replica_enabled
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Marks a client that has just written so get_read_session pins its reads
+    to the primary until the replica has caught up.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            not read_replica_enabled
+            or scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = Config.READ_AFTER_WRITE_SECONDS
+                until = int(time.time()) + seconds
+                # Same attributes as the auth cookies, or a cross-site
+                # frontend never sends it back
+                cookie = (
+                    f"{READ_AFTER_WRITE_COOKIE}={until}; Max-Age={seconds}; "
+                    f"Path=/; HttpOnly; SameSite={Config.COOKIE_SAMESITE}"
+                )
+                if Config.COOKIE_SECURE:
+                    cookie += "; Secure"
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,12 +1,21 @@
 from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
-from db.db import get_session
+from db.db import get_read_session, get_session
+from jobs.service import submit_upload
 from stock_cgcel.schemas import (
     StockCGCELCode,
     StockCGCELCreateIndentResponse,
@@ -20,6 +29,8 @@ from stock_cgcel.schemas import (
     StockCGCELUpdate,
 )
 from stock_cgcel.service import StockCGCELService
+from utils.etag import etag_headers, not_modified, reference_etag
+from utils.responses import FastJSONResponse
 
 stock_cgcel_router = APIRouter()
 stock_cgcel_service = StockCGCELService()
@@ -28,43 +39,27 @@ role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
 
 
 """
-Upload Stock CGCEL data via CSV file.
+Upload Stock CGCEL data via CSV or XLSX file.
+Runs as a background job; poll /jobs/{id} with the returned id for progress
+and the result. With dry_run, only validate and report every error found;
+nothing is written.
 """
 
 
 @stock_cgcel_router.post(
     "/upload",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[role_checker],
 )
 async def upload_stock_cgcel(
-    session: AsyncSession = Depends(get_session),
     file: UploadFile = File(...),
+    dry_run: bool = False,
     _=Depends(access_token_bearer),
 ):
-    try:
-        result = await stock_cgcel_service.upload_stock_cgcel(session, file)
-    except Exception as exc:
-        return JSONResponse(
-            content={
-                "message": "Processing failed",
-                "resolution": str(exc),
-                "type": "error",
-            },
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
-    if result.get("type") in ("warning", "error"):
-        return JSONResponse(
-            content=result,
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
-
-    # Success
-    return JSONResponse(
-        content=result,
-        status_code=status.HTTP_200_OK,
+    job = await submit_upload(
+        "stock_cgcel", file, stock_cgcel_service.upload_stock_cgcel, dry_run
     )
+    return FastJSONResponse(content=job.as_dict(), status_code=status.HTTP_202_ACCEPTED)
 
 
 """
@@ -83,7 +78,7 @@ async def enquiry_stock_cgcel(
     own: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     try:
@@ -99,7 +94,9 @@ async def enquiry_stock_cgcel(
             offset,
             return_total=True,
         )
-        return {"records": result, "total_records": total_records}
+        return FastJSONResponse(
+            content={"records": result, "total_records": total_records}
+        )
     except Exception as exc:
         return {"records": [], "total_records": 0}
 
@@ -115,10 +112,16 @@ List all spare records.
     status_code=status.HTTP_200_OK,
 )
 async def list_spare_list(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("stock_cgcel")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     spare_list = await stock_cgcel_service.list_cgcel_stock(session)
-    return spare_list
+    return FastJSONResponse(content=spare_list, headers=etag_headers(etag))
 
 
 """
@@ -133,13 +136,18 @@ List all spare records by division.
 )
 async def list_spare_list(
     division: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
+    etag = reference_etag("stock_cgcel")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     spare_list = await stock_cgcel_service.list_cgcel_stock_by_division(
         session, division
     )
-    return spare_list
+    return FastJSONResponse(content=spare_list, headers=etag_headers(etag))
 
 
 """
@@ -290,7 +298,7 @@ async def enquiry_indent_cgcel(
     to_indent_number: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _=Depends(access_token_bearer),
 ):
     try:
@@ -307,6 +315,8 @@ async def enquiry_indent_cgcel(
             offset,
             return_total=True,
         )
-        return {"records": result, "total_records": total_records}
+        return FastJSONResponse(
+            content={"records": result, "total_records": total_records}
+        )
     except Exception as exc:
         return {"records": [], "total_records": 0}
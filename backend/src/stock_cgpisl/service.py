@@ -1,73 +1,93 @@
-import csv
-import io
 from datetime import date
 from typing import List, Optional
 
 from fastapi import UploadFile
-from pydantic import ValidationError
-from sqlalchemy import case, insert, update
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
 
 from exceptions import SpareNotFound, StockNotAvailable
+from jobs.service import report_progress
 from stock_cgpisl.models import StockCGPISL, StockCGPISLIndent
 from stock_cgpisl.schemas import (
-    StockCGPISLEnquiry,
-    StockCGPISLEnquiryStockList,
     StockCGPISLGenerateIndentRecord,
     StockCGPISLGenerateIndentResponse,
     StockCGPISLIndentCreate,
-    StockCGPISLIndentEnquiry,
     StockCGPISLSchema,
 )
+from utils.bulk import bulk_insert, bulk_update, existing_keys
+from utils.csv_stream import upload_reader
 from utils.date_utils import format_date_ddmmyyyy
+from utils.validation import ErrorReport, RowError, validate_batches
 
+UPLOAD_INT_FIELDS = {"cnf_qty", "grc_qty", "own_qty", "indent_qty"}
+UPLOAD_FLOAT_FIELDS = {"alp", "sale_price"}
 
-class StockCGPISLService:
-    async def upload_stock_cgpisl(self, session: AsyncSession, file: UploadFile):
-        content = await file.read()
 
-        try:
-            text = content.decode("utf-8-sig")
-        except Exception:
-            text = content.decode("utf-8", errors="ignore")
+def parse_stock_cgpisl_row(raw_row: dict) -> dict:
+    row = {}
+    for k, v in raw_row.items():
+        key = (k or "").strip().lower()
+        val = v.strip() if v else ""
+        row[key] = val if val != "" else None
+
+    spare_code = row.get("spare_code")
+    if not spare_code:
+        raise RowError("spare_code", "Missing spare_code")
+
+    division = row.get("division")
+    spare_description = row.get("spare_description")
+    hsn_code = row.get("hsn_code")
+
+    parsed = {
+        "spare_code": spare_code,
+        "division": division.upper() if division else None,
+        "spare_description": (spare_description.upper() if spare_description else None),
+        "hsn_code": hsn_code.upper() if hsn_code else None,
+    }
 
-        reader = csv.DictReader(io.StringIO(text))
+    # Unparseable quantities and prices are blanked, as they always have been
+    for field in UPLOAD_INT_FIELDS:
+        if field in row:
+            try:
+                parsed[field] = int(row[field]) if row[field] is not None else None
+            except Exception:
+                parsed[field] = None
+
+    for field in UPLOAD_FLOAT_FIELDS:
+        if field in row:
+            try:
+                parsed[field] = float(row[field]) if row[field] is not None else None
+            except Exception:
+                parsed[field] = None
 
-        if not reader.fieldnames:
+    return StockCGPISLSchema(**parsed).dict(exclude_unset=True)
+
+
+class StockCGPISLService:
+    async def upload_stock_cgpisl(
+        self, session: AsyncSession, file: UploadFile, dry_run: bool = False
+    ):
+        reader = upload_reader(file)
+        if not await reader.fieldnames():
             return {
                 "message": "Invalid file",
-                "resolution": "CSV file has no headers",
+                "resolution": "CSV/XLSX file has no headers",
                 "type": "warning",
             }
 
-        raw_rows = []
-        line_no = 1
-
         # -------------------------
-        # Step 1: Normalize rows
+        # Step 1: Normalize + validate rows on the process pool
         # -------------------------
-        for raw_row in reader:
-            line_no += 1
-
-            row = {}
-            for k, v in raw_row.items():
-                key = (k or "").strip().lower()
-                val = v.strip() if v else ""
-                row[key] = val if val != "" else None
-
-            if not row.get("spare_code"):
-                return {
-                    "message": "Invalid CSV",
-                    "resolution": f"Missing spare_code at line {line_no}",
-                    "type": "warning",
-                }
-
-            raw_rows.append(row)
+        report = ErrorReport()
+        records = []
+        async for batch, errors in validate_batches(reader, parse_stock_cgpisl_row):
+            report.add(batch, errors)
+            records.extend(batch)
 
-        if not raw_rows:
+        if not records and not report:
             return {
                 "message": "Uploaded Successfully",
                 "resolution": "No valid rows found",
@@ -75,89 +95,48 @@ class StockCGPISLService:
             }
 
         # -------------------------
-        # Step 2: Fetch existing spare codes
+        # Step 2: Fetch existing spare codes (read only, dry runs too)
         # -------------------------
-        spare_codes = [r["spare_code"] for r in raw_rows]
+        spare_codes = [values["spare_code"] for _, values in records]
 
-        result = await session.execute(
-            select(StockCGPISL.spare_code).where(
-                StockCGPISL.spare_code.in_(spare_codes)
-            )
+        existing_codes = await existing_keys(
+            session, [StockCGPISL.spare_code], spare_codes
         )
-        existing_codes = set(result.scalars().all())
 
         # -------------------------
-        # Step 3: Parse + validate rows
+        # Step 3: Enforce mandatory fields ONLY for inserts
         # -------------------------
-        records = []
-
-        int_fields = {"cnf_qty", "grc_qty", "own_qty", "indent_qty"}
-        float_fields = {
-            "alp",
-            "sale_price",
-        }
-
-        for row in raw_rows:
-            spare_code = row.get("spare_code")
-            is_new = spare_code not in existing_codes
-
-            division = row.get("division")
-            spare_description = row.get("spare_description")
-            hsn_code = row.get("hsn_code")
-
-            # Enforce mandatory fields ONLY for inserts
-            if is_new:
-                if not division or not spare_description or not hsn_code:
-                    return {
-                        "message": f"Missing mandatory fields for {spare_code}",
-                        "resolution": "Division, Description and HSN Code",
-                        "type": "warning",
-                    }
-
-            parsed = {
-                "spare_code": spare_code,
-                "division": division.upper() if division else None,
-                "spare_description": (
-                    spare_description.upper() if spare_description else None
-                ),
-                "hsn_code": hsn_code.upper() if hsn_code else None,
-            }
-
-            for field in int_fields:
-                if field in row:
-                    try:
-                        parsed[field] = (
-                            int(row[field]) if row[field] is not None else None
-                        )
-                    except Exception:
-                        parsed[field] = None
-
-            for field in float_fields:
-                if field in row:
-                    try:
-                        parsed[field] = (
-                            float(row[field]) if row[field] is not None else None
-                        )
-                    except Exception:
-                        parsed[field] = None
+        missing = []
+        for line, values in records:
+            if values["spare_code"] in existing_codes:
+                continue
+            for field in ("division", "spare_description", "hsn_code"):
+                if not values.get(field):
+                    missing.append(
+                        {
+                            "line": line,
+                            "field": field,
+                            "error": "Mandatory for a new spare code",
+                        }
+                    )
+        report.extend(missing)
 
-            try:
-                validated = StockCGPISLSchema(**parsed)
-            except ValidationError as ve:
-                return {
-                    "message": f"Validation failed for spare_code {spare_code}",
-                    "resolution": str(ve),
-                    "type": "warning",
-                }
+        if dry_run or report:
+            await session.rollback()
+            return report.response()
 
-            records.append((validated, is_new))
+        report_progress(phase="writing")
+        records = [
+            (values, values["spare_code"] not in existing_codes)
+            for _, values in records
+        ]
 
         # -------------------------
         # Step 4: Determine present fields
         # -------------------------
         present_fields = set()
-        for r, _ in records:
-            present_fields.update(r.dict(exclude_unset=True).keys())
+        for values, _ in records:
+            present_fields.update(values.keys())
 
         present_fields.discard("spare_code")
 
@@ -167,10 +146,10 @@ class StockCGPISLService:
         to_insert = []
         to_update = {}
 
-        for r, is_new in records:
+        for values, is_new in records:
             data = {
                 k: v
-                for k, v in r.dict(exclude_unset=True).items()
+                for k, v in values.items()
                 if k == "spare_code" or k in present_fields
             }
 
@@ -181,7 +160,7 @@ class StockCGPISLService:
                 data.pop("division", None)
                 data.pop("spare_description", None)
                 data.pop("hsn_code", None)
-                to_update[r.spare_code] = data
+                to_update[values["spare_code"]] = data
 
         inserted = 0
         updated = 0
@@ -191,7 +170,7 @@ class StockCGPISLService:
         # -------------------------
         # Step 6: Zero numeric columns present in CSV
         # -------------------------
-        numeric_fields = int_fields | float_fields
+        numeric_fields = UPLOAD_INT_FIELDS | UPLOAD_FLOAT_FIELDS
         zero_fields = present_fields & numeric_fields
 
         if zero_fields:
@@ -201,32 +180,10 @@ class StockCGPISLService:
         # Step 7: Bulk INSERT / UPDATE
         # -------------------------
         try:
-            if to_insert:
-                await session.execute(insert(table).values(to_insert))
-                inserted = len(to_insert)
-
-            if to_update:
-                update_fields = present_fields - {
-                    "division",
-                    "spare_description",
-                    "hsn_code",
-                }
-
-                values_dict = {}
-                for field in update_fields:
-                    values_dict[field] = case(
-                        {k: v.get(field) for k, v in to_update.items() if field in v},
-                        value=table.c.spare_code,
-                    )
-
-                stmt = (
-                    update(table)
-                    .where(table.c.spare_code.in_(to_update.keys()))
-                    .values(**values_dict)
-                )
-
-                await session.execute(stmt)
-                updated = len(to_update)
+            inserted = await bulk_insert(session, table, to_insert)
+            updated = await bulk_update(
+                session, table, ["spare_code"], list(to_update.values())
+            )
 
             await session.commit()
 
@@ -338,17 +295,18 @@ class StockCGPISLService:
 
         result = await session.execute(statement)
         rows = result.all()
+        # Plain dicts shaped like StockCGPISLEnquiry
         records = [
-            StockCGPISLEnquiry(
-                spare_code=row.StockCGPISL.spare_code,
-                division=row.StockCGPISL.division,
-                spare_description=row.StockCGPISL.spare_description,
-                cnf_qty=row.StockCGPISL.cnf_qty,
-                grc_qty=row.StockCGPISL.grc_qty,
-                own_qty=row.StockCGPISL.own_qty,
-                alp=row.StockCGPISL.alp,
-                sale_price=row.StockCGPISL.sale_price,
-            )
+            {
+                "spare_code": row.StockCGPISL.spare_code,
+                "division": row.StockCGPISL.division,
+                "spare_description": row.StockCGPISL.spare_description,
+                "cnf_qty": row.StockCGPISL.cnf_qty,
+                "grc_qty": row.StockCGPISL.grc_qty,
+                "own_qty": row.StockCGPISL.own_qty,
+                "alp": row.StockCGPISL.alp,
+                "sale_price": row.StockCGPISL.sale_price,
+            }
             for row in rows
         ]
 
@@ -363,10 +321,7 @@ class StockCGPISLService:
         result = await session.execute(statement)
         rows = result.all()
         return [
-            StockCGPISLEnquiryStockList(
-                spare_code=row.spare_code,
-                spare_description=row.spare_description,
-            )
+            {"spare_code": row.spare_code, "spare_description": row.spare_description}
             for row in rows
         ]
 
@@ -379,10 +334,7 @@ class StockCGPISLService:
         result = await session.execute(statement)
         rows = result.all()
         return [
-            StockCGPISLEnquiryStockList(
-                spare_code=row.spare_code,
-                spare_description=row.spare_description,
-            )
+            {"spare_code": row.spare_code, "spare_description": row.spare_description}
             for row in rows
         ]
 
@@ -594,17 +546,18 @@ class StockCGPISLService:
 
         result = await session.execute(statement)
         rows = result.all()
+        # Plain dicts shaped like StockCGPISLIndentEnquiry
         records = [
-            StockCGPISLIndentEnquiry(
-                spare_code=row.StockCGPISLIndent.spare_code,
-                division=row.StockCGPISLIndent.division,
-                spare_description=row.StockCGPISLIndent.spare_description,
-                indent_qty=row.StockCGPISLIndent.indent_qty,
-                indent_number=row.StockCGPISLIndent.indent_number,
-                indent_date=format_date_ddmmyyyy(row.StockCGPISLIndent.indent_date),
-                party_name=row.StockCGPISLIndent.party_name,
-                created_by=row.StockCGPISLIndent.created_by,
-            )
+            {
+                "spare_code": row.StockCGPISLIndent.spare_code,
+                "division": row.StockCGPISLIndent.division,
+                "spare_description": row.StockCGPISLIndent.spare_description,
+                "indent_qty": row.StockCGPISLIndent.indent_qty,
+                "indent_number": row.StockCGPISLIndent.indent_number,
+                "indent_date": format_date_ddmmyyyy(row.StockCGPISLIndent.indent_date),
+                "party_name": row.StockCGPISLIndent.party_name,
+                "created_by": row.StockCGPISLIndent.created_by,
+            }
             for row in rows
         ]
         if return_total:
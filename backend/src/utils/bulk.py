@@ -0,0 +1,181 @@
+import logging
+import time
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import and_, bindparam, insert, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement, TableClause
+
+from jobs.service import report_write
+from utils.etag import note_written
+
+logger = logging.getLogger("uvicorn.error")
+
+# PostgreSQL (and asyncpg) accept at most this many bind parameters per statement
+MAX_BIND_PARAMETERS = 32767
+
+
+def chunk_size(parameters_per_row: int) -> int:
+    """Rows per statement that stay within the bind parameter limit."""
+    return max(1, MAX_BIND_PARAMETERS // max(parameters_per_row, 1))
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _chunk_written(table: str, method: str, rows: int, seconds: float):
+    rate = rows / seconds if seconds else 0.0
+    logger.debug(
+        "%s %s: %d rows in %.3fs (%.0f rows/s)", method, table, rows, seconds, rate
+    )
+    report_write(rows, seconds)
+
+
+async def driver_connection(session: AsyncSession):
+    """The asyncpg connection behind `session`, inside its current transaction."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+def quote_columns(
+    session: AsyncSession, columns: Sequence[str], alias: str = ""
+) -> str:
+    """Comma separated, quoted column list, each prefixed with `alias.` if given."""
+    preparer = session.bind.dialect.identifier_preparer
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + preparer.quote(column) for column in columns)
+
+
+async def create_staging_table(
+    session: AsyncSession, name: str, source_table: str, columns: List[str]
+):
+    """
+    Empty temp table with `columns` typed as in `source_table` but without its
+    constraints, dropped when the transaction ends (commit or rollback).
+    """
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE {name} ON COMMIT DROP AS "
+            f"SELECT {quote_columns(session, columns)} FROM {source_table} "
+            "WITH NO DATA"
+        )
+    )
+
+
+async def copy_to_table(
+    session: AsyncSession, name: str, columns: List[str], records: Iterable[tuple]
+):
+    """COPY `records` (tuples in `columns` order) into `name` over the session."""
+    connection = await driver_connection(session)
+    await connection.copy_records_to_table(name, records=records, columns=columns)
+
+
+async def bulk_copy(session: AsyncSession, name: str, rows: Sequence[dict]) -> int:
+    """
+    COPY `rows` (dicts with the same keys) into the table `name` in one go.
+    Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+    columns = list(rows[0])
+    start = time.perf_counter()
+    await copy_to_table(
+        session,
+        name,
+        columns,
+        (tuple(row.get(column) for column in columns) for row in rows),
+    )
+    # COPY bypasses the session's statement hooks
+    note_written(session, name)
+    _chunk_written(name, "COPY", len(rows), time.perf_counter() - start)
+    return len(rows)
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    table: TableClause,
+    rows: Sequence[dict],
+    copy: bool = False,
+) -> int:
+    """
+    Insert `rows` (dicts with the same keys) into `table` in chunks sized to
+    the bind parameter limit, each sent as one executemany so the driver
+    batches it. With `copy`, they go through bulk_copy instead; faster, but
+    constraint violations surface as asyncpg errors, not IntegrityError.
+    Returns the number of rows written.
+    """
+    if copy:
+        return await bulk_copy(session, table.name, rows)
+    if not rows:
+        return 0
+    columns = list(rows[0])
+
+    statement = insert(table)
+    for chunk in chunked(rows, chunk_size(len(columns))):
+        start = time.perf_counter()
+        await session.execute(statement, list(chunk))
+        _chunk_written(table.name, "INSERT", len(chunk), time.perf_counter() - start)
+    return len(rows)
+
+
+async def bulk_update(
+    session: AsyncSession,
+    table: TableClause,
+    keys: Sequence[str],
+    rows: Sequence[dict],
+) -> int:
+    """
+    Update the `table` row matching each dict's `keys` columns with the rest
+    of its values, as executemany UPDATEs chunked to the bind parameter limit.
+    Rows setting different columns go in separate statements. Returns the
+    number of rows given.
+    """
+    groups: Dict[tuple, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        values = [column for column in columns if column not in keys]
+        if not values:
+            continue
+        statement = (
+            update(table)
+            .where(and_(*(table.c[key] == bindparam(f"k_{key}") for key in keys)))
+            .values({column: bindparam(f"v_{column}") for column in values})
+        )
+        parameters = [
+            {
+                **{f"k_{key}": row[key] for key in keys},
+                **{f"v_{column}": row[column] for column in values},
+            }
+            for row in group
+        ]
+        for chunk in chunked(parameters, chunk_size(len(columns))):
+            start = time.perf_counter()
+            await session.execute(statement, list(chunk))
+            _chunk_written(
+                table.name, "UPDATE", len(chunk), time.perf_counter() - start
+            )
+    return len(rows)
+
+
+async def existing_keys(
+    session: AsyncSession, columns: Sequence[ColumnElement], keys: Iterable
+) -> set:
+    """
+    Which of `keys` are already in the table, matched on `columns`: scalars
+    for a single column, tuples for several. The IN lists are chunked to the
+    bind parameter limit.
+    """
+    target = columns[0] if len(columns) == 1 else tuple_(*columns)
+    found = set()
+    for chunk in chunked(list(dict.fromkeys(keys)), chunk_size(len(columns))):
+        result = await session.execute(select(*columns).where(target.in_(chunk)))
+        if len(columns) == 1:
+            found.update(result.scalars().all())
+        else:
+            found.update(tuple(row) for row in result.all())
+    return found
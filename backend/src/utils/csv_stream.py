@@ -0,0 +1,153 @@
+import csv
+import io
+from datetime import date, datetime, time
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from config import Config
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # XLSX uploads are refused without it
+    load_workbook = None
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class CSVUploadReader:
+    """
+    Reads a CSV upload incrementally from its spooled temp file, decoding and
+    parsing `batch_size` rows at a time in a worker thread. Memory stays at
+    one batch however large the file is.
+
+        reader = CSVUploadReader(file)
+        if not await reader.fieldnames():
+            ...  # no header row
+        async for rows in reader.batches():
+            ...
+    """
+
+    def __init__(self, file: UploadFile, batch_size: Optional[int] = None):
+        self.file = file
+        self.batch_size = batch_size or Config.UPLOAD_BATCH_SIZE
+        self._text: Optional[io.TextIOWrapper] = None
+        self._reader: Optional[csv.DictReader] = None
+
+    def _open(self) -> List[str]:
+        self.file.file.seek(0)
+        # utf-8-sig drops an Excel BOM; undecodable bytes are skipped as before
+        self._text = io.TextIOWrapper(
+            self.file.file, encoding="utf-8-sig", errors="ignore", newline=""
+        )
+        self._reader = csv.DictReader(self._text)
+        return self._reader.fieldnames or []
+
+    def _close(self):
+        # Leave the upload's file open; FastAPI closes it after the request
+        if self._text is not None:
+            self._text.detach()
+
+    async def fieldnames(self) -> List[str]:
+        if self._reader is None:
+            return await run_in_threadpool(self._open)
+        return self._reader.fieldnames or []
+
+    def _next_batch(self) -> List[Dict[str, str]]:
+        batch = []
+        for row in self._reader:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    async def batches(self) -> AsyncIterator[List[Dict[str, str]]]:
+        try:
+            if not await self.fieldnames():
+                return
+            while True:
+                batch = await run_in_threadpool(self._next_batch)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            self._close()
+
+
+def cell_text(value) -> str:
+    """An XLSX cell value as the text a CSV export would hold for it."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if value.time() == time(0):
+            return value.date().isoformat()
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    # Excel keeps every number as a float; codes and quantities are whole
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class XLSXUploadReader(CSVUploadReader):
+    """
+    Reads the active sheet of an XLSX upload with openpyxl in read-only mode,
+    which streams rows out of the zipped sheet XML instead of loading the
+    workbook. The first row is the header; rows come out as the same dicts
+    of strings CSVUploadReader gives, so they feed the same validation.
+    """
+
+    def __init__(self, file: UploadFile, batch_size: Optional[int] = None):
+        super().__init__(file, batch_size)
+        self._header: Optional[List[str]] = None
+        self._workbook = None
+        self._rows = None
+
+    def _open(self) -> List[str]:
+        if load_workbook is None:
+            raise RuntimeError("XLSX uploads need openpyxl installed")
+        self.file.file.seek(0)
+        self._workbook = load_workbook(self.file.file, read_only=True, data_only=True)
+        self._rows = self._workbook.active.iter_rows(values_only=True)
+        header = [cell_text(value).strip() for value in next(self._rows, ())]
+        # Trailing empty header cells are formatting, not columns
+        while header and not header[-1]:
+            header.pop()
+        self._header = header
+        return header
+
+    def _close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+
+    async def fieldnames(self) -> List[str]:
+        if self._header is None:
+            return await run_in_threadpool(self._open)
+        return self._header
+
+    def _next_batch(self) -> List[Dict[str, str]]:
+        header = self._header
+        batch = []
+        for values in self._rows:
+            # Skip blank rows, as csv.DictReader skips blank lines
+            if all(value is None for value in values):
+                continue
+            values = tuple(values) + (None,) * (len(header) - len(values))
+            batch.append(
+                {name: cell_text(value) for name, value in zip(header, values)}
+            )
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+
+def upload_reader(
+    file: UploadFile, batch_size: Optional[int] = None
+) -> CSVUploadReader:
+    """The streaming reader for an upload: XLSX by name or type, else CSV."""
+    name = (file.filename or "").lower()
+    if name.endswith(".xlsx") or file.content_type == XLSX_CONTENT_TYPE:
+        return XLSXUploadReader(file, batch_size)
+    return CSVUploadReader(file, batch_size)
@@ -0,0 +1,127 @@
+import secrets
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import Config
+from db.db import read_replica_enabled
+
+# Tables whose writes are versioned, for ETags and caches keyed on the versions
+REFERENCE_TABLES = (
+    "action",
+    "employees",
+    "customer",
+    "stock_cgcel",
+    "stock_cgpisl",
+    "holidays",
+    "complaints",
+)
+
+# Versions live in this process only, so a restart must never reuse an ETag
+BOOT_ID = secrets.token_hex(4)
+
+_versions: Dict[str, int] = {table: 0 for table in REFERENCE_TABLES}
+_bumped_at: Dict[str, float] = {table: 0.0 for table in REFERENCE_TABLES}
+_lock = threading.Lock()
+
+_PENDING_KEY = "etag_tables_written"
+
+
+def bump_versions(tables: Iterable[str]):
+    """Invalidate the ETags of the given tables (unknown tables are ignored)."""
+    now = time.monotonic()
+    with _lock:
+        for table in tables:
+            if table in _versions:
+                _versions[table] += 1
+                _bumped_at[table] = now
+
+
+def table_versions(*tables: str) -> Tuple[int, ...]:
+    """Current versions of `tables`; any committed write to one changes them."""
+    with _lock:
+        return tuple(_versions[table] for table in tables)
+
+
+def reference_etag(*tables: str) -> Optional[str]:
+    """
+    Strong ETag for a response built only from `tables`, or None when it must
+    not be cached. The epoch part rolls every REFERENCE_ETAG_EPOCH_SECONDS,
+    bounding staleness when several workers each keep their own versions.
+    """
+    now = time.monotonic()
+    with _lock:
+        if read_replica_enabled and any(
+            now - _bumped_at[table] < Config.READ_AFTER_WRITE_SECONDS
+            for table in tables
+        ):
+            # The replica may not have the write yet; don't pin its old rows
+            return None
+        versions = ".".join(str(_versions[table]) for table in tables)
+    epoch = int(time.time() // Config.REFERENCE_ETAG_EPOCH_SECONDS)
+    return f'"{BOOT_ID}-{epoch}-{versions}"'
+
+
+def etag_headers(etag: Optional[str]) -> Dict[str, str]:
+    if etag is None:
+        return {}
+    # Browsers must revalidate every time; the 304 costs no query
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """A 304 response if the client's If-None-Match matches `etag`, else None."""
+    if etag is None:
+        return None
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    # Weak comparison: compression turns our strong ETag into W/"..."
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def note_written(session, *tables: str):
+    """Record writes the session's hooks can't see (e.g. COPY) for its commit."""
+    session = getattr(session, "sync_session", session)
+    _pending(session).update(tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(state):
+    # update()/insert()/delete() statements run through session.execute
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _pending(state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session, flush_context):
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table is not None:
+            pending.add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_writes(session):
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        bump_versions(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_writes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,5 +1,10 @@
 import os
 import re
+from functools import lru_cache
+
+STATIC_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "static")
+)
 
 
 def safe_join(base_dir, user_filename):
@@ -17,6 +22,20 @@ def safe_join(base_dir, user_filename):
     return full_path
 
 
+@lru_cache(maxsize=None)
+def load_static_file(filename: str) -> bytes:
+    """
+    Read a file from static/ once and keep it in memory.
+    PDF templates only change on deploy, so reports don't need to re-read them.
+    """
+    path = safe_join(STATIC_DIR, filename)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template PDF not found at {path}")
+
+
 def split_text_to_lines(text, font, font_size, max_width, string_width_func):
     """
     Splits text into lines that fit within max_width for the given font and size.
@@ -0,0 +1,29 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, List
+
+from exceptions import InvalidCursor
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Opaque keyset cursor holding the sort key of the last row on a page.
+    Dates are kept as ISO strings; decode_cursor hands back what was put in.
+    """
+    key = [value.isoformat() if isinstance(value, date) else value for value in values]
+    payload = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """The `size` values encoded in `cursor`; InvalidCursor if it is not one."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor()
+    if not isinstance(key, list) or len(key) != size:
+        raise InvalidCursor()
+    return key
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+# Every limiter by name, for the rate_limit_* metrics
+LIMITERS: Dict[str, "TokenBucketLimiter"] = {}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "locked_until", "strikes")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.locked_until = 0.0
+        self.strikes = 0
+
+
+class TokenBucketLimiter:
+    """
+    In-process token bucket per key: `burst` attempts at once, refilled at
+    `rate_per_minute`. Only attempts passed to hit() take a token, so callers
+    decide what counts (e.g. failed logins only).
+
+    With `lockout_seconds`, the hit that empties a key's bucket locks the key
+    out for that long, doubling for each lockout until the bucket has had
+    time to refill completely, up to `max_lockout_seconds`. Without it, an
+    empty bucket just waits for its next token. At most `max_keys` keys are
+    tracked; the least recently seen are forgotten first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        burst: int,
+        max_keys: int,
+        lockout_seconds: float = 0.0,
+        max_lockout_seconds: float = 0.0,
+    ):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.limited = 0
+        self.lockouts = 0
+        self._buckets: "OrderedDict[Hashable, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        LIMITERS[name] = self
+
+    def _bucket(self, key: Hashable, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self.burst, now)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _refill(self, bucket: _Bucket, now: float) -> float:
+        if now < bucket.updated:
+            # Still locked out; no refill until the lockout ends
+            return bucket.tokens
+        tokens = bucket.tokens + (now - bucket.updated) * self.rate
+        if tokens >= self.burst:
+            # Quiet long enough to refill: forgive earlier lockouts
+            tokens = self.burst
+            bucket.strikes = 0
+        bucket.tokens = tokens
+        bucket.updated = now
+        return tokens
+
+    def retry_after(self, key: Hashable) -> float:
+        """0 if `key` may make an attempt now, else seconds to wait. Takes no token."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self.allowed += 1
+                return 0.0
+            if bucket.locked_until > now:
+                self.limited += 1
+                return bucket.locked_until - now
+            tokens = self._refill(bucket, now)
+            if tokens < 1 and not self.lockout_seconds:
+                self.limited += 1
+                return (1 - tokens) / self.rate
+            self.allowed += 1
+            return 0.0
+
+    def hit(self, key: Hashable) -> float:
+        """Take one token for `key`. Returns 0, or seconds until the next attempt."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(key, now)
+            tokens = max(self._refill(bucket, now) - 1, 0.0)
+            bucket.tokens = tokens
+            if tokens >= 1:
+                return 0.0
+            if not self.lockout_seconds:
+                return (1 - tokens) / self.rate
+
+            bucket.strikes += 1
+            lockout = min(
+                self.lockout_seconds * 2 ** (bucket.strikes - 1),
+                self.max_lockout_seconds,
+            )
+            bucket.locked_until = now + lockout
+            # No refill while locked out, so failing straight after escalates
+            bucket.updated = bucket.locked_until
+            self.lockouts += 1
+            return lockout
+
+    def reset(self, key: Hashable):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,38 @@
+import json
+from datetime import date, datetime, time
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the standard library
+    orjson = None
+
+
+def _json_default(obj):
+    if isinstance(obj, (date, datetime, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when FAST_JSON_RESPONSES is on and orjson
+    is installed. Accepts plain dicts/lists with dates and times, so routes can
+    return rows without building a pydantic model per row.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None and Config.FAST_JSON_RESPONSES:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=_json_default,
+        ).encode("utf-8")
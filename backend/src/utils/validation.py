@@ -0,0 +1,162 @@
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from config import Config
+from jobs.service import report_progress
+from utils.csv_stream import CSVUploadReader
+
+# A row parser takes a raw CSV row and returns the values to write, raising
+# ValidationError/ValueError if the row is bad. It runs in a worker process,
+# so it has to be a module-level function.
+RowParser = Callable[[Dict[str, str]], dict]
+ValidatedBatch = Tuple[List[Tuple[int, dict]], List[dict]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def validation_workers() -> int:
+    return Config.UPLOAD_VALIDATION_WORKERS or os.cpu_count() or 1
+
+
+def validation_pool() -> ProcessPoolExecutor:
+    """The upload validation pool, started on first use."""
+    global _pool
+    if _pool is None:
+        # spawn: never fork the server with its event loop and thread pools
+        _pool = ProcessPoolExecutor(
+            max_workers=validation_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_validation_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+class RowError(ValueError):
+    """A row-level check failed on `field`."""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+def error_details(exc: Exception) -> List[dict]:
+    if isinstance(exc, ValidationError):
+        return [
+            {
+                "field": ".".join(str(part) for part in error["loc"]) or None,
+                "error": error["msg"],
+            }
+            for error in exc.errors()
+        ]
+    return [{"field": getattr(exc, "field", None), "error": str(exc)}]
+
+
+def validate_rows(
+    parse_row: RowParser, rows: List[Dict[str, str]], first_line: int
+) -> ValidatedBatch:
+    """
+    Parse every row of a batch: ([(line, values)], [error]). Lines count the
+    header as line 1, as the uploads always have.
+    """
+    records = []
+    errors = []
+    for line, raw_row in enumerate(rows, start=first_line):
+        try:
+            records.append((line, parse_row(raw_row)))
+        except (ValidationError, ValueError, TypeError) as exc:
+            errors.extend({"line": line, **detail} for detail in error_details(exc))
+    return records, errors
+
+
+async def _finish(in_flight: deque) -> ValidatedBatch:
+    rows, future = in_flight.popleft()
+    batch = await future
+    report_progress(rows=rows)
+    return batch
+
+
+async def validate_batches(
+    reader: CSVUploadReader, parse_row: RowParser
+) -> AsyncIterator[ValidatedBatch]:
+    """
+    Validate an upload on the process pool, yielding each batch's records and
+    errors in file order. A few batches per worker are kept in flight while
+    the next ones are read, so the event loop only ever awaits. Rows count
+    towards the progress of the upload job running this, if any.
+    """
+    loop = asyncio.get_running_loop()
+    pool = validation_pool()
+    in_flight = deque()
+    line = 2
+    try:
+        async for rows in reader.batches():
+            task = partial(validate_rows, parse_row, rows, line)
+            in_flight.append((len(rows), loop.run_in_executor(pool, task)))
+            line += len(rows)
+            if len(in_flight) >= 2 * validation_workers():
+                yield await _finish(in_flight)
+        while in_flight:
+            yield await _finish(in_flight)
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+
+
+class ErrorReport:
+    """Every error of an upload, listing up to UPLOAD_MAX_REPORTED_ERRORS."""
+
+    def __init__(self):
+        self.rows = 0
+        self.count = 0
+        self.errors: List[dict] = []
+
+    def add(self, records: list, errors: List[dict]):
+        """A validated batch: count its rows and keep its errors."""
+        self.rows += len(records) + len({error["line"] for error in errors})
+        self.extend(errors)
+
+    def extend(self, errors: List[dict]):
+        """Errors found later on rows already counted."""
+        self.count += len(errors)
+        room = Config.UPLOAD_MAX_REPORTED_ERRORS - len(self.errors)
+        if room > 0:
+            self.errors.extend(errors[:room])
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def response(self) -> dict:
+        if not self.count:
+            return {
+                "message": "Validation passed",
+                "resolution": f"{self.rows} rows checked, no errors found",
+                "type": "success",
+                "errors": [],
+            }
+        self.errors.sort(key=lambda error: error["line"])
+        first = self.errors[0]
+        listed = ""
+        if self.count > len(self.errors):
+            listed = f" (first {len(self.errors)} listed)"
+        return {
+            "message": f"Validation failed: {self.count} errors in {self.rows} rows",
+            "resolution": (
+                f"Line {first['line']}: {first['field'] or 'row'}: "
+                f"{first['error']}{listed}"
+            ),
+            "type": "warning",
+            "errors": self.errors,
+        }
@@ -0,0 +1,181 @@
+import asyncio
+import io
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from auth.service import AuthService
+from complaints.service import ComplaintsService
+from config import Config
+from db.db import (
+    async_engine,
+    async_read_engine,
+    async_read_session_maker,
+    read_replica_enabled,
+)
+from grc_cgcel.service import GRCCGCELService
+from grc_cgpisl.service import GRCCGPISLService
+from menu.service import MenuService
+from parameter.service import ParameterService
+from stock_cgcel.service import StockCGCELService
+from stock_cgpisl.service import StockCGPISLService
+from utils.file_utils import STATIC_DIR, load_static_file
+
+logger = logging.getLogger("uvicorn.error")
+
+WarmupStep = Callable[[], Awaitable[None]]
+_steps: List[Tuple[str, WarmupStep]] = []
+
+# Filled in as steps finish; served by /admin/warmup
+warmup_report: Dict = {"status": "not started", "steps": {}, "total_seconds": None}
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def warmup_step(name: str):
+    """Register a coroutine to run, in registration order, during warm-up."""
+
+    def register(func: WarmupStep) -> WarmupStep:
+        _steps.append((name, func))
+        return func
+
+    return register
+
+
+async def _open_connections(engine: AsyncEngine, count: int):
+    # Hold all of them at once so the pool really grows to `count`
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    connections = [conn for conn in results if not isinstance(conn, BaseException)]
+    try:
+        await asyncio.gather(
+            *(conn.exec_driver_sql("SELECT 1") for conn in connections)
+        )
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+    failures = [exc for exc in results if isinstance(exc, BaseException)]
+    if failures:
+        raise failures[0]
+
+
+@warmup_step("pool")
+async def warm_pool():
+    count = min(Config.WARMUP_CONNECTIONS, Config.DB_POOL_SIZE)
+    await _open_connections(async_engine, count)
+    if read_replica_enabled:
+        await _open_connections(async_read_engine, count)
+
+
+@warmup_step("statements")
+async def warm_statements():
+    """
+    Run the hot read paths once so SQLAlchemy compiles and caches their SQL,
+    using the same service calls (and so the same cache keys) as the routes.
+    """
+    complaints = ComplaintsService()
+    menu = MenuService()
+    async with async_read_session_maker() as session:
+        await complaints.enquiry_complaint(session, all_complaints="Y", limit=1)
+        await complaints.get_complaint_filter_data(session)
+        await complaints.get_action_heads(session)
+        await complaints.get_employees(session)
+        await menu.complaint_overview(session)
+        await menu.stock_overview(session)
+        await menu.grc_overview(session)
+        await StockCGCELService().enquiry_stock_cgcel(
+            session, limit=1, return_total=True
+        )
+        await StockCGPISLService().enquiry_stock_cgpisl(
+            session, limit=1, return_total=True
+        )
+        await GRCCGCELService().enquiry_grc_cgcel(
+            session, grc_status="N", limit=1, return_total=True
+        )
+        await GRCCGPISLService().enquiry_grc_cgpisl(
+            session, grc_status="N", limit=1, return_total=True
+        )
+        await ParameterService().list_parameters(session)
+
+
+@warmup_step("login_context")
+async def warm_login_context():
+    async with async_read_session_maker() as session:
+        await AuthService().get_login_context(session)
+
+
+def _warm_pdf():
+    for filename in sorted(os.listdir(STATIC_DIR)):
+        if filename.endswith(".pdf"):
+            PdfReader(io.BytesIO(load_static_file(filename)))
+
+    # First use of the standard fonts loads their metrics
+    packet = io.BytesIO()
+    can = canvas.Canvas(packet, pagesize=A4)
+    for font in ("Helvetica", "Helvetica-Bold"):
+        can.setFont(font, 10)
+        can.drawString(10, 10, "WARMUP")
+        stringWidth("WARMUP", font, 10)
+    can.save()
+
+
+@warmup_step("pdf")
+async def warm_pdf():
+    await asyncio.to_thread(_warm_pdf)
+
+
+async def run_warmup():
+    warmup_report["status"] = "running"
+    start = time.perf_counter()
+    for name, step in _steps:
+        step_start = time.perf_counter()
+        try:
+            await step()
+            status = "ok"
+        except Exception as exc:
+            # A failed step only means a colder first request
+            status = f"failed: {exc}"
+            logger.warning("Warm-up step %s failed: %s", name, exc)
+        warmup_report["steps"][name] = {
+            "status": status,
+            "seconds": round(time.perf_counter() - step_start, 3),
+        }
+    warmup_report["total_seconds"] = round(time.perf_counter() - start, 3)
+    warmup_report["status"] = "done"
+    logger.info(
+        "Warm-up finished in %.3fs: %s",
+        warmup_report["total_seconds"],
+        ", ".join(
+            f"{name} {step['seconds']}s ({step['status']})"
+            for name, step in warmup_report["steps"].items()
+        ),
+    )
+
+
+async def start_warmup():
+    """
+    Run warm-up, but never hold up startup for more than WARMUP_BUDGET_SECONDS.
+    Anything unfinished by then carries on in the background.
+    """
+    global _warmup_task
+    if not Config.WARMUP_ENABLED:
+        warmup_report["status"] = "disabled"
+        return
+    _warmup_task = asyncio.create_task(run_warmup())
+    await asyncio.wait({_warmup_task}, timeout=Config.WARMUP_BUDGET_SECONDS)
+    if not _warmup_task.done():
+        logger.warning(
+            "Warm-up still running after %ss budget; continuing in background",
+            Config.WARMUP_BUDGET_SECONDS,
+        )
+
+
+async def stop_warmup():
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
@@ -101,6 +101,8 @@ const API_ENDPOINTS = {
 
   PARAMETER_LIST: `${BASE_API_URL}parameter/parameters`,
   PARAMETER_UPDATE: `${BASE_API_URL}parameter/update`,
+
+  JOB_STATUS: `${BASE_API_URL}jobs/`, //append job id
 };
 
 export default API_ENDPOINTS;
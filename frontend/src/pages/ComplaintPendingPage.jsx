@@ -5,7 +5,7 @@ import React, {
   useEffect,
   useRef,
 } from "react";
-import { complaintEnquiry } from "../services/complaintEnquiryService";
+import { complaintEnquiryPage } from "../services/complaintEnquiryService";
 import { fetchComplaintFilterData } from "../services/complaintFilterDataService";
 
 // Option constants
@@ -228,6 +228,9 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
   const [error, setError] = useState(null);
   const [page, setPage] = useState(1);
   const [hasMore, setHasMore] = useState(false);
+  const [totalRecords, setTotalRecords] = useState(null);
+  // cursorsRef.current[n] is the cursor that fetches page n + 1
+  const cursorsRef = useRef([""]);
   const PAGE_SIZE = 50;
   // Fetch filter options for action_head and action_by
   // Track if filter options are loaded
@@ -283,22 +286,28 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
       setLoading(true);
       setError(null);
       try {
-        const offset = (pageNum - 1) * PAGE_SIZE;
+        if (pageNum === 1) cursorsRef.current = [""];
         // Add selectedCompany as complaint_head if present
         const mergedParams = selectedCompany
           ? { ...params, complaint_head: selectedCompany }
           : params;
-        const response = await complaintEnquiry(
-          mergedParams,
-          PAGE_SIZE,
-          offset,
-        );
-        setData(response || []);
-        setHasMore((response || []).length === PAGE_SIZE);
+        // Cached: paging through the same filters counts them only once
+        const { records, next_cursor, total_records } =
+          await complaintEnquiryPage(
+            mergedParams,
+            PAGE_SIZE,
+            cursorsRef.current[pageNum - 1] ?? "",
+            "cached",
+          );
+        cursorsRef.current[pageNum] = next_cursor;
+        setData(records || []);
+        setHasMore(Boolean(next_cursor));
+        setTotalRecords(total_records ?? null);
       } catch (err) {
         setError("Failed to fetch complaints.");
         setData([]);
         setHasMore(false);
+        setTotalRecords(null);
       } finally {
         setLoading(false);
       }
@@ -318,6 +327,7 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
         if (typeof saved.page === "number") setPage(saved.page);
         if (Array.isArray(saved.data)) setData(saved.data);
         if (typeof saved.hasMore === "boolean") setHasMore(saved.hasMore);
+        if (Array.isArray(saved.cursors)) cursorsRef.current = saved.cursors;
       }
     } catch (e) {
       // ignore parse errors
@@ -349,7 +359,13 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
       try {
         sessionStorage.setItem(
           "pendingPageState",
-          JSON.stringify({ filters, page: 1, data, hasMore }),
+          JSON.stringify({
+            filters,
+            page: 1,
+            data,
+            hasMore,
+            cursors: cursorsRef.current,
+          }),
         );
       } catch (e) {}
       fetchData(params, 1);
@@ -372,7 +388,13 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
     try {
       sessionStorage.setItem(
         "pendingPageState",
-        JSON.stringify({ filters, page: newPage, data, hasMore }),
+        JSON.stringify({
+          filters,
+          page: newPage,
+          data,
+          hasMore,
+          cursors: cursorsRef.current,
+        }),
       );
     } catch (e) {}
     setPage(newPage);
@@ -591,7 +613,13 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
                         try {
                           sessionStorage.setItem(
                             "pendingPageState",
-                            JSON.stringify({ filters, page, data, hasMore }),
+                            JSON.stringify({
+                              filters,
+                              page,
+                              data,
+                              hasMore,
+                              cursors: cursorsRef.current,
+                            }),
                           );
                         } catch (e) {}
                         navigate("/UpdateComplaint", {
@@ -606,7 +634,13 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
                           try {
                             sessionStorage.setItem(
                               "pendingPageState",
-                              JSON.stringify({ filters, page, data, hasMore }),
+                              JSON.stringify({
+                                filters,
+                                page,
+                                data,
+                                hasMore,
+                                cursors: cursorsRef.current,
+                              }),
                             );
                           } catch (e) {}
                           navigate("/UpdateComplaint", {
@@ -692,7 +726,11 @@ const ComplaintPendingPage = ({ selectedCompany }) => {
                 >
                   &#8592; Prev
                 </button>
-                <span className="mx-2 font-semibold">Page {page}</span>
+                <span className="mx-2 font-semibold">
+                  Page {page}
+                  {totalRecords !== null &&
+                    ` of ${Math.max(1, Math.ceil(totalRecords / PAGE_SIZE))}`}
+                </span>
                 <button
                   className="px-3 py-1 rounded-full border border-purple-300 bg-white text-purple-700 font-semibold shadow-sm hover:bg-purple-50 transition disabled:opacity-40 disabled:cursor-not-allowed"
                   onClick={() => handlePageChange(page + 1)}
@@ -25,19 +25,25 @@ const ComplaintUploadPage = () => {
   const [uploading, setUploading] = useState(false);
   const [uploadingNew, setUploadingNew] = useState(false);
 
-  const isCsvFile = (file) =>
-    file &&
-    ((file.name || "").toLowerCase().endsWith(".csv") ||
-      file.type === "text/csv");
+  const isUploadFile = (file) => {
+    const name = (file?.name || "").toLowerCase();
+    return (
+      file &&
+      (name.endsWith(".csv") ||
+        name.endsWith(".xlsx") ||
+        file.type === "text/csv" ||
+        file.type === "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    );
+  };
 
   const handleFileChange = (e) => {
     const f = e.target.files?.[0];
     if (!f) return;
 
-    if (!isCsvFile(f)) {
+    if (!isUploadFile(f)) {
       setError({
         message: "Invalid file type",
-        resolution: "Only CSV files are allowed",
+        resolution: "Only CSV or XLSX files are allowed",
         type: "warning",
       });
       setShowToast(true);
@@ -51,10 +57,10 @@ const ComplaintUploadPage = () => {
     const f = e.target.files?.[0];
     if (!f) return;
 
-    if (!isCsvFile(f)) {
+    if (!isUploadFile(f)) {
       setError({
         message: "Invalid file type",
-        resolution: "Only CSV files are allowed",
+        resolution: "Only CSV or XLSX files are allowed",
         type: "warning",
       });
       setShowToast(true);
@@ -161,10 +167,10 @@ const ComplaintUploadPage = () => {
                 {!file ? (
                   <>
                     <Typography variant="body1" fontWeight={500}>
-                      Select a CSV file
+                      Select a CSV or XLSX file
                     </Typography>
                     <Typography variant="caption" color="text.secondary">
-                      Only .csv files are supported
+                      Only .csv and .xlsx files are supported
                     </Typography>
 
                     <Button
@@ -184,7 +190,7 @@ const ComplaintUploadPage = () => {
                         id="complaint-file-input"
                         hidden
                         type="file"
-                        accept=".csv,text/csv"
+                        accept=".csv,text/csv,.xlsx,application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                         onChange={handleFileChange}
                       />
                     </Button>
@@ -246,10 +252,10 @@ const ComplaintUploadPage = () => {
                 {!newFile ? (
                   <>
                     <Typography variant="body1" fontWeight={500}>
-                      Select a CSV file (New)
+                      Select a CSV or XLSX file (New)
                     </Typography>
                     <Typography variant="caption" color="text.secondary">
-                      Only .csv files are supported
+                      Only .csv and .xlsx files are supported
                     </Typography>
 
                     <Button
@@ -269,7 +275,7 @@ const ComplaintUploadPage = () => {
                         id="complaint-new-file-input"
                         hidden
                         type="file"
-                        accept=".csv,text/csv"
+                        accept=".csv,text/csv,.xlsx,application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                         onChange={handleNewFileChange}
                       />
                     </Button>
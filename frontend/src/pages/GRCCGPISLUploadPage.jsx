@@ -22,19 +22,25 @@ const GRCCGPISLUploadPage = () => {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
 
-  const isCsvFile = (file) =>
-    file &&
-    ((file.name || "").toLowerCase().endsWith(".csv") ||
-      file.type === "text/csv");
+  const isUploadFile = (file) => {
+    const name = (file?.name || "").toLowerCase();
+    return (
+      file &&
+      (name.endsWith(".csv") ||
+        name.endsWith(".xlsx") ||
+        file.type === "text/csv" ||
+        file.type === "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    );
+  };
 
   const handleFileChange = (e) => {
     const f = e.target.files?.[0];
     if (!f) return;
 
-    if (!isCsvFile(f)) {
+    if (!isUploadFile(f)) {
       setError({
         message: "Invalid file type",
-        resolution: "Only CSV files are allowed",
+        resolution: "Only CSV or XLSX files are allowed",
         type: "warning",
       });
       setShowToast(true);
@@ -109,10 +115,10 @@ const GRCCGPISLUploadPage = () => {
             {!file ? (
               <>
                 <Typography variant="body1" fontWeight={500}>
-                  Select a CSV file
+                  Select a CSV or XLSX file
                 </Typography>
                 <Typography variant="caption" color="text.secondary">
-                  Only .csv files are supported
+                  Only .csv and .xlsx files are supported
                 </Typography>
 
                 <Button
@@ -132,7 +138,7 @@ const GRCCGPISLUploadPage = () => {
                     id="complaint-file-input"
                     hidden
                     type="file"
-                    accept=".csv,text/csv"
+                    accept=".csv,text/csv,.xlsx,application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     onChange={handleFileChange}
                   />
                 </Button>
@@ -14,11 +14,10 @@ import { authFetch } from "./authFetchService";
  * @param {number} [offset=0] - Offset for pagination
  * @returns {Promise<Array>} List of complaint enquiry records
  */
-async function complaintEnquiry(params = {}, limit = 50, offset = 0) {
-  // Add pagination params
-  const mergedParams = { ...params, limit, offset };
+async function fetchEnquiry(mergedParams) {
   const query = Object.entries(mergedParams)
-    .filter(([_, v]) => v !== undefined && v !== "")
+    .filter(([_, v]) => v !== undefined && v !== null)
+    .filter(([k, v]) => v !== "" || k === "cursor")
     .map(([k, v]) => `${encodeURIComponent(k)}=${encodeURIComponent(v)}`)
     .join("&");
   const url = query
@@ -40,4 +39,30 @@ async function complaintEnquiry(params = {}, limit = 50, offset = 0) {
   return data;
 }
 
-export { complaintEnquiry };
+async function complaintEnquiry(params = {}, limit = 50, offset = 0) {
+  // Add pagination params
+  return fetchEnquiry({ ...params, limit, offset });
+}
+
+/**
+ * Fetch one page of complaint enquiry records by cursor. Unlike offset
+ * paging, later pages cost the server no more than the first.
+ * @param {Object} params - Filter params, as for complaintEnquiry
+ * @param {number} [limit=50] - Number of records per page
+ * @param {string} [cursor=""] - next_cursor of the previous page; "" for the first
+ * @param {string} [returnTotal] - "exact", "cached" or "estimated" to also get
+ *   total_records; omit to skip counting
+ * @returns {Promise<{records: Array, next_cursor: (string|null), total_records: number}>}
+ *   The page, the cursor of the next one (null on the last page) and, with
+ *   returnTotal, the number of matching complaints
+ */
+async function complaintEnquiryPage(
+  params = {},
+  limit = 50,
+  cursor = "",
+  returnTotal = undefined,
+) {
+  return fetchEnquiry({ ...params, limit, cursor, return_total: returnTotal });
+}
+
+export { complaintEnquiry, complaintEnquiryPage };
@@ -1,16 +1,17 @@
 import API_ENDPOINTS from "../config/api";
 import { authFetch } from "./authFetchService";
+import { waitForUploadJob } from "./uploadJobService";
 
 /**
- * Upload a CSV file (protected route)
- * @param {File} file - CSV file to upload
- * @returns {Promise<object>} returns parsed response or throws on error
+ * Upload a CSV or XLSX file (protected route)
+ * @param {File} file - CSV or XLSX file to upload
+ * @returns {Promise<object>} returns the upload result or throws on error
  */
 async function UploadComplaints(file) {
   if (!file) {
     throw {
       message: "No file provided",
-      resolution: "Select a .csv file to upload",
+      resolution: "Select a .csv or .xlsx file to upload",
     };
   }
 
@@ -31,7 +32,8 @@ async function UploadComplaints(file) {
     };
   }
 
-  return data;
+  // The upload runs in the background; wait for its result
+  return waitForUploadJob(data);
 }
 
 export { UploadComplaints };
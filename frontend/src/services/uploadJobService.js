@@ -0,0 +1,39 @@
+import API_ENDPOINTS from "../config/api";
+import { authFetch } from "./authFetchService";
+
+const POLL_INTERVAL_MS = 1000;
+
+/**
+ * Poll a background upload job until it finishes (protected route)
+ * @param {object} job - Job returned by an upload endpoint
+ * @returns {Promise<object>} the upload's result, or throws it if the upload failed
+ */
+async function waitForUploadJob(job) {
+  let current = job;
+  while (current.phase !== "done" && current.phase !== "failed") {
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    const response = await authFetch(`${API_ENDPOINTS.JOB_STATUS}${job.id}`, {
+      method: "GET",
+    });
+    current = await response.json();
+    if (!response.ok) {
+      throw {
+        message: current.message || "Upload status unavailable",
+        resolution: current.resolution || "Try again or contact support",
+        type: "error",
+      };
+    }
+  }
+
+  const result = current.result || {};
+  if (current.phase === "failed") {
+    throw {
+      message: result.message || "Upload failed",
+      resolution: result.resolution || "Try again or contact support",
+      type: result.type || "error",
+    };
+  }
+  return result;
+}
+
+export { waitForUploadJob };